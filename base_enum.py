@@ -9,7 +9,17 @@ class BaseEnum(Enum):
         has issues when classes are imported from two different locations
 
         As such we define equality to work on a string comparison instead.
+        Members imported from the same location are compared by identity first.
         """
+        if self is __value:
+            return True
         if self.__class__.__name__ == __value.__class__.__name__:
             return self.value == __value.value
         return False
+
+    def __hash__(self) -> int:
+        """
+        Equal members always share a value, so hashing the value keeps
+        hashing consistent with the equality above.
+        """
+        return hash(self._value_)
@@ -3,6 +3,7 @@ from enum import auto
 from typing import Optional
 
 from base_enum import BaseEnum
+from ruleset import Ruleset
 from team import MonsterTeam
 
 
@@ -18,8 +19,13 @@ class Battle:
         TEAM2 = auto()
         DRAW = auto()
 
-    def __init__(self, verbosity=0) -> None:
+    def __init__(self, verbosity=0, ruleset: Optional[Ruleset]=None) -> None:
+        """
+        :verbosity: How much of the battle to print.
+        :ruleset: The rules attacks are resolved with. Defaults to Ruleset.default().
+        """
         self.verbosity = verbosity
+        self.ruleset = ruleset or Ruleset.default()
         self.action1 = None
         self.action2 = None 
         
@@ -98,10 +104,10 @@ class Battle:
             
         if out1_speed == out2_speed:
             if action1 != None:
-                self.out1.attack(self.out2)
+                self.out1.attack(self.out2, self.ruleset)
                 
             if action2 != None:
-                self.out2.attack(self.out1)
+                self.out2.attack(self.out1, self.ruleset)
                 
             if self.out1.alive() and self.out2.alive():
                 self.out1.set_hp(self.out1.get_hp() - 1)
@@ -137,7 +143,7 @@ class Battle:
             
         if out1_speed > out2_speed:
             if action1 != None:
-                self.out1.attack(self.out2)
+                self.out1.attack(self.out2, self.ruleset)
                 
                 if not self.out2.alive():
                     self.out1.level_up()
@@ -152,7 +158,7 @@ class Battle:
                     return self.Result.TEAM1
                     
             if action2 != None:
-                self.out2.attack(self.out1)
+                self.out2.attack(self.out1, self.ruleset)
                 
                 if not self.out1.alive():
                     self.out2.level_up()
@@ -172,7 +178,7 @@ class Battle:
             alive1, alive2 = True, True
             
             if action2 != None:
-                self.out2.attack(self.out1)
+                self.out2.attack(self.out1, self.ruleset)
                 
                 if not self.out1.alive():
                     self.out2.level_up()
@@ -187,7 +193,7 @@ class Battle:
                     return self.Result.TEAM2
                     
             if action1 != None:
-                self.out1.attack(self.out2) # here add action None
+                self.out1.attack(self.out2, self.ruleset) # here add action None
                 
                 if not self.out2.alive():
                     self.out1.level_up()
@@ -0,0 +1,70 @@
+"""
+Benchmarks for ArrayR bulk operations against element by element loops.
+
+Run from the repository root:
+    python -m benchmarks.bench_arrays [sizes...]
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+
+from data_structures.referential_array import ArrayR
+
+
+def loop_from_list(l: list) -> ArrayR:
+    ret = ArrayR(len(l))
+    for x in range(len(l)):
+        ret[x] = l[x]
+    return ret
+
+
+def loop_to_list(a: ArrayR) -> list:
+    ret = []
+    for x in range(len(a)):
+        ret.append(a[x])
+    return ret
+
+
+def loop_str(a: ArrayR) -> str:
+    ret_str = "["
+    for x in range(len(a)):
+        ret_str += str(a[x])
+        ret_str += ", "
+    return ret_str[:-2] + "]"
+
+
+def loop_index(a: ArrayR, item) -> int:
+    for x in range(len(a)):
+        if a[x] == item:
+            return x
+    raise ValueError("Value does not exist")
+
+
+def timed(f, *args) -> float:
+    start = time.perf_counter()
+    f(*args)
+    return time.perf_counter() - start
+
+
+def bench(n: int) -> list[tuple[str, float, float]]:
+    """ (operation, element by element time, bulk time) for arrays of n elements. """
+    l = list(range(n))
+    a = ArrayR.from_list(l)
+    return [
+        ("from_list", timed(loop_from_list, l), timed(ArrayR.from_list, l)),
+        ("to_list", timed(loop_to_list, a), timed(a.to_list)),
+        ("copy", timed(lambda: loop_from_list(loop_to_list(a))), timed(a.copy)),
+        ("slice", timed(lambda: loop_from_list(loop_to_list(a)[n // 4:3 * n // 4])), timed(lambda: a[n // 4:3 * n // 4])),
+        ("iterate", timed(lambda: [a[x] for x in range(len(a))]), timed(lambda: [item for item in a])),
+        ("index", timed(loop_index, a, n - 1), timed(a.index, n - 1)),
+        ("str", timed(loop_str, a), timed(str, a)),
+    ]
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**6]
+    print(f"{'n':>10} {'operation':>10} {'loop (s)':>10} {'bulk (s)':>10} {'speedup':>8}")
+    for n in sizes:
+        for name, loop, bulk in bench(n):
+            print(f"{n:>10} {name:>10} {loop:>10.4f} {bulk:>10.4f} {loop / bulk:>7.1f}x")
@@ -0,0 +1,73 @@
+"""
+Benchmarks for ArrayHeap: as a priority queue against ArraySortedList (push n random keys then pop
+them all), heapify against n pushes, and a bounded top-k heap against sorting everything.
+
+Run from the repository root:
+    python -m benchmarks.bench_heap [sizes...]
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+
+from random_gen import RandomStream
+
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.heap import ArrayHeap
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+TOP_K = 10
+
+
+def bench(n: int) -> tuple[float, float, float, float, float, float]:
+    """ Seconds for each of: sorted list push/pop, heap push/pop, n pushes, heapify, sort top-k, bounded heap top-k. """
+    keys = RandomStream(123).randints(0, 10 * n, n)
+    items = [ListItem(i, keys[i]) for i in range(n)]
+    timings = []
+
+    sorted_list = ArraySortedList(n)
+    start = time.perf_counter()
+    for item in items:
+        sorted_list.add(item)
+    while not sorted_list.is_empty():
+        sorted_list.delete_at_index(0)
+    timings.append(time.perf_counter() - start)
+
+    heap = ArrayHeap(n)
+    start = time.perf_counter()
+    for item in items:
+        heap.push(item)
+    while not heap.is_empty():
+        heap.pop()
+    timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for item in items:
+        heap.push(item)
+    timings.append(time.perf_counter() - start)
+    heap.clear()
+
+    start = time.perf_counter()
+    heap.heapify(ArrayR.from_list(items))
+    timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    sorted(items, key=lambda item: item.key, reverse=True)[:TOP_K]
+    timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    top = ArrayHeap(0, bound=TOP_K)
+    for item in items:
+        top.push(item)
+    top.ranked()
+    timings.append(time.perf_counter() - start)
+    return timings[0], timings[1], timings[2], timings[3], timings[4], timings[5]
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 3 * 10**4]
+    print(f"{'n':>8} {'list pq (s)':>12} {'heap pq (s)':>12} {'pushes (s)':>11} {'heapify (s)':>12} {'sort top (s)':>13} {'heap top (s)':>13}")
+    for n in sizes:
+        list_pq, heap_pq, pushes, heapify, sort_top, heap_top = bench(n)
+        print(f"{n:>8} {list_pq:>12.3f} {heap_pq:>12.3f} {pushes:>11.3f} {heapify:>12.3f} {sort_top:>13.3f} {heap_top:>13.3f}")
@@ -0,0 +1,64 @@
+"""
+Benchmarks for the growable CircularQueue and ArrayStack: pushing then popping n elements one at
+a time, and in bulk with extend / serve_many / pop_many. The time per element should stay flat
+as n grows, however many times the arrays double and halve.
+
+Run from the repository root:
+    python -m benchmarks.bench_queue_stack [sizes...]
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+
+from data_structures.queue_adt import GrowableCircularQueue
+from data_structures.stack_adt import GrowableArrayStack
+
+BATCH = 1000
+
+
+def bench(n: int) -> tuple[float, float, float, float]:
+    """ Nanoseconds per element for the queue and the stack, one at a time and in batches. """
+    timings = []
+
+    queue = GrowableCircularQueue()
+    start = time.perf_counter()
+    for i in range(n):
+        queue.append(i)
+    for i in range(n):
+        queue.serve()
+    timings.append(time.perf_counter() - start)
+
+    stack = GrowableArrayStack()
+    start = time.perf_counter()
+    for i in range(n):
+        stack.push(i)
+    for i in range(n):
+        stack.pop()
+    timings.append(time.perf_counter() - start)
+
+    batch = list(range(BATCH))
+    start = time.perf_counter()
+    for _ in range(n // BATCH):
+        queue.extend(batch)
+    for _ in range(n // BATCH):
+        queue.serve_many(BATCH)
+    timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(n // BATCH):
+        stack.extend(batch)
+    for _ in range(n // BATCH):
+        stack.pop_many(BATCH)
+    timings.append(time.perf_counter() - start)
+
+    per_element = [t * 1e9 / n for t in timings]
+    return per_element[0], per_element[1], per_element[2], per_element[3]
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 10**5, 10**6]
+    print(f"{'n':>9} {'queue (ns)':>11} {'stack (ns)':>11} {'queue bulk (ns)':>16} {'stack bulk (ns)':>16}")
+    for n in sizes:
+        queue, stack, queue_bulk, stack_bulk = bench(n)
+        print(f"{n:>9} {queue:>11.0f} {stack:>11.0f} {queue_bulk:>16.0f} {stack_bulk:>16.0f}")
@@ -0,0 +1,35 @@
+"""
+Benchmarks for bulk random draws (block jump-ahead over packed lanes, see RandomStream.randoms)
+against one RandomGen call per number.
+
+Run from the repository root:
+    python -m benchmarks.bench_random [sizes...]
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+
+from random_gen import RandomStream
+
+
+def bench_randint(k: int) -> tuple[float, float]:
+    """ Time to draw k numbers from 1 to 6 with randint, then with randints. """
+    stream = RandomStream(123)
+    start = time.perf_counter()
+    for _ in range(k):
+        stream.randint(1, 6)
+    single = time.perf_counter() - start
+
+    stream = RandomStream(123)
+    start = time.perf_counter()
+    stream.randints(1, 6, k)
+    return single, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    print(f"{'k':>10} {'randint (s)':>12} {'randints (s)':>13} {'speedup':>8}")
+    for k in sizes:
+        single, bulk = bench_randint(k)
+        print(f"{k:>10} {single:>12.3f} {bulk:>13.3f} {single / bulk:>7.1f}x")
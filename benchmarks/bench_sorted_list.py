@@ -0,0 +1,61 @@
+"""
+Benchmarks for ArraySortedList insertion: one item at a time with element by element shifts,
+with bulk shifts, and as a single add_many batch.
+
+Run from the repository root:
+    python -m benchmarks.bench_sorted_list [sizes...]
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+
+from random_gen import RandomStream
+
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+
+class LoopSortedList(ArraySortedList):
+    """ ArraySortedList shifting and resizing one element at a time. """
+
+    def _shuffle_right(self, index: int) -> None:
+        for i in range(len(self), index, -1):
+            self.array[i] = self.array[i - 1]
+
+    def _shuffle_left(self, index: int) -> None:
+        for i in range(index, len(self)):
+            self.array[i] = self.array[i + 1]
+
+    def _resize(self, capacity: int = 0) -> None:
+        new_array = ArrayR(max(capacity, 2 * len(self.array)))
+        for i in range(self.length):
+            new_array[i] = self.array[i]
+        self.array = new_array
+
+
+def bench(n: int) -> tuple[float, float, float]:
+    """ Time to load n random keys with looping adds, bulk-shift adds and add_many. """
+    keys = RandomStream(123).randints(0, 10 * n, n)
+    items = ArrayR.from_list([ListItem(i, keys[i]) for i in range(n)])
+    timings = []
+    for cls in (LoopSortedList, ArraySortedList):
+        sorted_list = cls(1)
+        start = time.perf_counter()
+        for i in range(n):
+            sorted_list.add(items[i])
+        timings.append(time.perf_counter() - start)
+    sorted_list = ArraySortedList(1)
+    start = time.perf_counter()
+    sorted_list.add_many(items)
+    timings.append(time.perf_counter() - start)
+    return timings[0], timings[1], timings[2]
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 3 * 10**4]
+    print(f"{'n':>8} {'loop add (s)':>13} {'bulk add (s)':>13} {'add_many (s)':>13}")
+    for n in sizes:
+        loop, bulk, many = bench(n)
+        print(f"{n:>8} {loop:>13.3f} {bulk:>13.3f} {many:>13.3f}")
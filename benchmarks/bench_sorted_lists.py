@@ -0,0 +1,57 @@
+"""
+Benchmarks for ArraySortedList against BTreeSortedList: loading n random keys one add at a time,
+then n updates that each delete the item at a random position and add it back with a new key,
+the way BattleTower keeps its ranking as lives change.
+
+ArraySortedList shifts O(n) items per operation, so it is skipped above ARRAY_LIMIT items.
+
+Run from the repository root:
+    python -m benchmarks.bench_sorted_lists [sizes...]
+e.g. python -m benchmarks.bench_sorted_lists 1000 10000 100000 1000000 10000000
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+
+from random_gen import RandomStream
+
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.btree_sorted_list import BTreeSortedList
+from data_structures.sorted_list_adt import ListItem
+
+ARRAY_LIMIT = 10**4
+
+
+def bench(cls: type, n: int) -> tuple[float, float]:
+    """ Time to add n random keys one at a time, then to apply n random updates. """
+    stream = RandomStream(123)
+    keys = stream.randints(0, 10 * n, n)
+    positions = stream.randints(0, n - 1, n)
+    new_keys = stream.randints(0, 10 * n, n)
+
+    sorted_list = cls(1)
+    start = time.perf_counter()
+    for i in range(n):
+        sorted_list.add(ListItem(i, keys[i]))
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n):
+        item = sorted_list.delete_at_index(positions[i])
+        item.key = new_keys[i]
+        sorted_list.add(item)
+    update = time.perf_counter() - start
+    return load, update
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**3, 10**4, 10**5, 10**6]
+    print(f"{'n':>9} {'array add (s)':>14} {'array upd (s)':>14} {'btree add (s)':>14} {'btree upd (s)':>14}")
+    for n in sizes:
+        if n <= ARRAY_LIMIT:
+            array_load, array_update = (f"{t:.3f}" for t in bench(ArraySortedList, n))
+        else:
+            array_load = array_update = "-"
+        btree_load, btree_update = bench(BTreeSortedList, n)
+        print(f"{n:>9} {array_load:>14} {array_update:>14} {btree_load:>14.3f} {btree_update:>14.3f}")
@@ -0,0 +1,102 @@
+"""
+Benchmarks for BattleTower bookkeeping.
+
+Run from the repository root:
+    python -m benchmarks.bench_tower [sizes...]
+"""
+__docformat__ = 'reStructuredText'
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from battle import Battle
+from checkpoint import CheckpointedTower
+from random_gen import RandomGen
+from team import MonsterTeam
+from tower import BattleTower
+from helpers import Flamikin
+
+from data_structures.referential_array import ArrayR
+
+
+class InstantBattle(Battle):
+    """ Battle that team 1 always wins straight away, so only the tower's own bookkeeping is timed. """
+
+    def battle(self, team1: MonsterTeam, team2: MonsterTeam) -> Battle.Result:
+        return self.Result.TEAM1
+
+
+def make_tower(n: int) -> BattleTower:
+    """ A tower of n single Flamikin enemy teams with 2 lives each. """
+    provided = ArrayR.from_list([Flamikin])
+    tower = BattleTower(InstantBattle())
+    tower.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.PROVIDED, provided_monsters=provided))
+    teams = ArrayR(n)
+    for i in range(n):
+        teams[i] = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.PROVIDED, provided_monsters=provided)
+        teams[i].lives = 2
+    tower.set_enemy_teams(teams)
+    return tower
+
+
+def bench_full_tower(n: int) -> float:
+    """ Time to play every battle of an n team tower. """
+    tower = make_tower(n)
+    start = time.perf_counter()
+    while tower.battles_remaining():
+        tower.next_battle()
+    return time.perf_counter() - start
+
+
+def bench_checkpoint_overhead(n: int, every: int) -> tuple[float, float, float]:
+    """
+    Seconds to write the base of an n team tower of real battles, to play its battles, and spent in
+    CheckpointedTower itself with checkpoints every `every` battles.
+
+    The battles are timed inside BattleTower.next_battle, so the wrapper's own time is measured directly
+    rather than as the difference of two runs, which varies by more than the overhead. Battle output is discarded.
+    """
+    RandomGen.set_seed(123456789)
+    tower = BattleTower(Battle(verbosity=0))
+    tower.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM))
+    tower.my_team.lives = n
+    tower.generate_teams(n)
+    battles = 0.0
+    play = tower.next_battle
+
+    def timed_battle():
+        nonlocal battles
+        start = time.perf_counter()
+        res = play()
+        battles += time.perf_counter() - start
+        return res
+
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        run = CheckpointedTower(tower, os.path.join(directory, "tower.ckpt"), every)
+        base = time.perf_counter() - start
+        tower.next_battle = timed_battle
+        start = time.perf_counter()
+        while run.battles_remaining():
+            run.next_battle()
+        run.close()
+        total = time.perf_counter() - start
+    return base, battles, total - battles
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    print(f"{'teams':>10} {'total (s)':>10} {'per battle (us)':>16}")
+    for n in sizes:
+        elapsed = bench_full_tower(n)
+        print(f"{n:>10} {elapsed:>10.3f} {elapsed / n * 1e6:>16.2f}")
+
+    print()
+    print(f"{'teams':>10} {'every':>8} {'base (s)':>9} {'battles (s)':>12} {'wrapper (s)':>12} {'overhead':>9}")
+    for n, every in [(2000, 100), (2000, 500), (10000, 1000), (10000, 2500), (30000, 1000)]:
+        base, battles, wrapper = bench_checkpoint_overhead(n, every)
+        print(f"{n:>10} {every:>8} {base:>9.3f} {battles:>12.3f} {wrapper:>12.3f} {wrapper / battles:>9.2%}")
@@ -0,0 +1,313 @@
+"""
+Checkpointing for long BattleTower runs.
+
+A run is saved in these files:
+* path + ".base": the pickled tower as it was when checkpointing started. Written once.
+* path + ".journal": one fixed-size record per battle played since then (the enemy's base position,
+  its lives and the battle's element mask), append only.
+* path + ".order<k>": the order of the enemy teams, written only when they are reordered.
+* path: a small, versioned checkpoint of the counters, the RandomGen seed, and how much of the
+  journal and which order it covers, replaced atomically every `every` battles.
+* path + ".log": one line per battle played since the last checkpoint.
+
+Teams are back to their original lineup after every battle (next_battle regenerates them), so
+the only per-team state that changes is lives. The journal holds those changes together with the
+history, so a checkpoint only appends the records of the battles since the last one: its cost does
+not grow with the number of teams or the length of the run.
+Resuming loads the base, applies the journal up to the checkpoint, plays the logged battles again
+(checking they come out the same) and carries on from exactly where the run stopped. Journal records
+past the checkpoint, and log lines for battles the checkpoint already covers (left behind by a crash
+while checkpointing), are ignored.
+
+The journal and checkpoint are always fsynced. Log lines are buffered and only reach the file at the
+next checkpoint unless fsync is set, so a crash can lose the lines since the last one. That costs
+nothing but the check: those battles are played again from the checkpoint, with the same RandomGen state.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+from array import array
+
+from battle import Battle
+from random_gen import RandomGen
+from team import MonsterTeam
+from tower import BattleTower, EnemyStream, MetaHistory
+
+from data_structures.bset import BSet
+from data_structures.referential_array import ArrayR
+
+CHECKPOINT_VERSION = 2
+# Journal record: base position of the enemy team (-1 if streamed), its lives, the battle's element mask.
+RECORD_FIELDS = 3
+
+
+class CheckpointError(Exception):
+    """ Raised when a checkpoint cannot be used to resume a run. """
+    pass
+
+
+def _atomic_dump(obj, path: str) -> None:
+    """ Pickle obj to path, so that path always holds either the old or the new contents. """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class CheckpointedTower:
+    """
+    Wraps a BattleTower so its progress survives a crash.
+
+    Battles should only be played through this wrapper, so it can journal the state they change.
+
+    Usage:
+        run = CheckpointedTower(tower, "run.ckpt", every=1000)
+        while run.battles_remaining():
+            run.next_battle()
+        # After a crash:
+        run = CheckpointedTower.resume("run.ckpt", every=1000)
+    """
+
+    def __init__(self, tower: BattleTower, path: str, every: int = 1000, fsync: bool = False) -> None:
+        """
+        Start checkpointing tower, writing its base and a first checkpoint straight away.
+
+        :path: Checkpoint file, the base, journal, order and log are kept next to it.
+        :every: Number of battles between checkpoints.
+        :fsync: Whether to flush and fsync the log after every battle. Without it, a crash can lose
+            the log lines since the last checkpoint, and resume replays those battles unchecked.
+        """
+        if every <= 0:
+            raise ValueError("every should be positive.")
+        _atomic_dump({"version": CHECKPOINT_VERSION, "tower": tower}, path + ".base")
+        self._setup(tower, path, every, fsync)
+        self.journal = open(self.journal_path, "wb")
+        self.checkpoint()
+
+    def _setup(self, tower: BattleTower, path: str, every: int, fsync: bool) -> None:
+        """ Index the tower's enemy teams as they are in the base. """
+        self.tower = tower
+        self.path = path
+        self.base_path = path + ".base"
+        self.journal_path = path + ".journal"
+        self.log_path = path + ".log"
+        self.every = every
+        self.fsync = fsync
+        self.log = None
+        self.journal = None
+
+        self.streamed = isinstance(tower.enemy_teams, EnemyStream)
+        # Base position of every enemy team.
+        self.base_index: dict[int, int] = {}
+        if not self.streamed:
+            for i in range(len(tower.enemy_teams)):
+                self.base_index[id(tower.enemy_teams[i])] = i
+        # Base position and lives of the enemy team of every battle since the last checkpoint, and the
+        # number of battles journaled before them. Their element masks are taken from the history.
+        self.pending = array("q")
+        self.journaled = 0
+        # The teams whose order was last written, and the number of the order file it went to (0 for the base order).
+        self.order_teams = tower.enemy_teams
+        self.order_id = 0
+
+    def _order_path(self, order_id: int) -> str:
+        return f"{self.path}.order{order_id}"
+
+    def checkpoint(self) -> None:
+        """
+        Append the battles since the last checkpoint to the journal, atomically replace the checkpoint
+        file, and start a new log.
+        :complexity: O(b) for the b battles since the last checkpoint, plus O(n) for n enemy teams if they
+        were reordered since.
+        """
+        tower = self.tower
+        battles = len(self.pending) // 2
+        records = array("q", bytes(battles * RECORD_FIELDS * self.pending.itemsize))
+        records[0::RECORD_FIELDS] = self.pending[0::2]
+        records[1::RECORD_FIELDS] = self.pending[1::2]
+        history = tower.history
+        if battles > 0 and history is not None:
+            masks = history.masks[len(history) - battles:len(history)]
+            records[2::RECORD_FIELDS] = array("q", [elements.elems for elements in masks])
+        records.tofile(self.journal)
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.journaled += battles
+        self.pending = array("q")
+
+        old_order_id = self.order_id
+        if not self.streamed and self.order_teams is not tower.enemy_teams:
+            self._write_order()
+
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "seed": RandomGen.seed,
+            "journaled": self.journaled,
+            "current_enemy_index": tower.current_enemy_index,
+            "battles_played": tower.battles_played,
+            "enemies_alive": tower.enemies_alive,
+            "seen_elements": tower.seen_elements.elems,
+            "my_lives": tower.my_team.lives,
+        }
+        if self.streamed:
+            stream = tower.enemy_teams
+            state["stream"] = (stream.start, stream.generated, stream.team_window.to_list())
+        else:
+            state["order"] = self.order_id
+            state["ranked"] = tower.ranking is not None
+        _atomic_dump(state, self.path)
+        if self.order_id != old_order_id and old_order_id > 0:
+            os.remove(self._order_path(old_order_id))
+
+        if self.log is not None:
+            self.log.close()
+        # Anything logged so far is now covered by the checkpoint.
+        self.log = open(self.log_path, "w")
+
+    def _write_order(self) -> None:
+        """ Write the base position of the team at each position of enemy_teams to a new order file. """
+        teams = self.tower.enemy_teams
+        order = array("q", [self.base_index[id(teams[i])] for i in range(len(teams))])
+        self.order_id += 1
+        _atomic_dump(order.tobytes(), self._order_path(self.order_id))
+        self.order_teams = teams
+
+    def battles_remaining(self) -> bool:
+        return self.tower.battles_remaining()
+
+    def next_battle(self) -> tuple[Battle.Result, MonsterTeam, MonsterTeam, int, int]:
+        """ Play the tower's next battle, log it, and checkpoint every `every` battles. """
+        res = self._play()
+        if res[2] is None:
+            # No battles remaining, nothing was played.
+            return res
+        self.log.write(self._log_line(res))
+        if self.fsync:
+            self.log.flush()
+            os.fsync(self.log.fileno())
+        if self.tower.battles_played % self.every == 0:
+            self.checkpoint()
+        return res
+
+    def _play(self) -> tuple[Battle.Result, MonsterTeam, MonsterTeam, int, int]:
+        """ Play the next battle, and note the enemy team's lives for the journal. """
+        res = self.tower.next_battle()
+        if res[2] is not None:
+            self.pending.append(-1 if self.streamed else self.base_index[id(res[2])])
+            self.pending.append(res[4])
+        return res
+
+    def _log_line(self, res: tuple[Battle.Result, MonsterTeam, MonsterTeam, int, int]) -> str:
+        result, _, _, lives1, lives2 = res
+        return f"{self.tower.battles_played},{result.value},{lives1},{lives2}\n"
+
+    def close(self) -> None:
+        """ Write a final checkpoint and close the log and journal. """
+        self.checkpoint()
+        self.log.close()
+        self.log = None
+        self.journal.close()
+        self.journal = None
+
+    @classmethod
+    def resume(cls, path: str, every: int = 1000, fsync: bool = False) -> CheckpointedTower:
+        """
+        Restore a run from its base, journal, checkpoint and log.
+
+        The battles in the log are played again from the checkpoint, which gives the exact same
+        state as the interrupted run. A torn last line (from a crash mid-write) is ignored, and so are
+        lines for battles the checkpoint already covers.
+        :raises CheckpointError: if a file has an unknown version, the journal is shorter than the
+            checkpoint says, or the replay doesn't match the log.
+        """
+        with open(path + ".base", "rb") as f:
+            base = pickle.load(f)
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        for saved in (base, state):
+            if not isinstance(saved, dict) or saved.get("version") != CHECKPOINT_VERSION:
+                raise CheckpointError(f"Unsupported checkpoint version in {path}")
+
+        tower: BattleTower = base["tower"]
+        run = cls.__new__(cls)
+        run._setup(tower, path, every, fsync)
+        run._restore(state)
+
+        lines = []
+        if os.path.exists(run.log_path):
+            with open(run.log_path, "r") as f:
+                lines = f.read().split("\n")
+        # Everything before the last "\n" is complete, the rest is torn or empty.
+        for line in lines[:-1]:
+            try:
+                battle = int(line.split(",", 1)[0])
+            except ValueError:
+                raise CheckpointError(f"Malformed log line: {line}")
+            if battle <= tower.battles_played:
+                continue
+            replayed = run._log_line(run._play())
+            if replayed != line + "\n":
+                raise CheckpointError(f"Replay diverged from the log: got {replayed.strip()}, logged {line}")
+        run.checkpoint()
+        return run
+
+    def _restore(self, state: dict) -> None:
+        """ Apply the journal up to the checkpoint, and the checkpoint, to the base tower. """
+        tower = self.tower
+        self.journaled = state["journaled"]
+        records = array("q")
+        with open(self.journal_path, "rb") as f:
+            try:
+                records.fromfile(f, self.journaled * RECORD_FIELDS)
+            except EOFError:
+                raise CheckpointError(f"Journal {self.journal_path} is shorter than its checkpoint")
+        # Drop the records of battles played after the checkpoint, they are replayed from the log.
+        self.journal = open(self.journal_path, "r+b")
+        self.journal.truncate(len(records) * records.itemsize)
+        self.journal.seek(0, os.SEEK_END)
+
+        RandomGen.set_seed(state["seed"])
+        tower.my_team.lives = state["my_lives"]
+        if self.streamed:
+            stream = tower.enemy_teams
+            stream.start, stream.generated, window = state["stream"]
+            for i in range(len(window)):
+                stream.team_window[i] = window[i]
+                if window[i] is not None:
+                    stream.element_window[i] = tower.team_elements(window[i])
+        else:
+            base_teams = tower.enemy_teams
+            for i in range(0, len(records), RECORD_FIELDS):
+                base_teams[records[i]].lives = records[i + 1]
+            self.order_id = state["order"]
+            teams = base_teams
+            if self.order_id > 0:
+                order = array("q")
+                with open(self._order_path(self.order_id), "rb") as f:
+                    order.frombytes(pickle.load(f))
+                teams = ArrayR(len(order))
+                for i in range(len(order)):
+                    teams[i] = base_teams[order[i]]
+            self.order_teams = teams
+            base_history = tower.history
+            # Resets the counters, seen elements and history, which are restored below.
+            tower.set_enemy_teams(teams)
+            if state["ranked"]:
+                # Ranking keys are always (lives, position), so this rebuilds the same ranking.
+                tower.build_ranking()
+            if base_history is not None:
+                for i in range(len(base_history)):
+                    tower.history.append(base_history.masks[i])
+                for i in range(2, len(records), RECORD_FIELDS):
+                    elements = BSet()
+                    elements.elems = records[i]
+                    tower.history.append(elements)
+
+        tower.seen_elements = BSet()
+        tower.seen_elements.elems = state["seen_elements"]
+        tower.current_enemy_index = state["current_enemy_index"]
+        tower.battles_played = state["battles_played"]
+        tower.enemies_alive = state["enemies_alive"]
@@ -9,6 +9,32 @@ from data_structures.sorted_list_adt import *
 __author__ = 'Maria Garcia de la Banda and Brendon Taylor. Modified by Alexey Ignatiev and Graeme Gange'
 __docformat__ = 'reStructuredText'
 
+def merge_sort_items(items: ArrayR[ListItem]) -> ArrayR[ListItem]:
+    """
+    Returns a new array with the items stably sorted by key.
+    :complexity: O(n log n) where n is len(items).
+    """
+    n = len(items)
+    src, dst = ArrayR(n), ArrayR(n)
+    for i in range(n):
+        src[i] = items[i]
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid, hi = min(lo + width, n), min(lo + 2 * width, n)
+            i, j = lo, mid
+            for k in range(lo, hi):
+                if j >= hi or (i < mid and src[i].key <= src[j].key):
+                    dst[k] = src[i]
+                    i += 1
+                else:
+                    dst[k] = src[j]
+                    j += 1
+        src, dst = dst, src
+        width *= 2
+    return src
+
+
 class ArraySortedList(SortedList[T]):
     """ SortedList ADT implemented with arrays. """
     MIN_CAPACITY = 1
@@ -57,23 +83,22 @@ class ArraySortedList(SortedList[T]):
         return False
 
     def _shuffle_right(self, index: int) -> None:
-        """ Shuffle items to the right up to a given position. """
-        for i in range(len(self), index, -1):
-            self.array[i] = self.array[i - 1]
+        """ Shuffle items to the right up to a given position, as one bulk copy. """
+        if index < len(self):
+            self.array[index + 1:len(self) + 1] = self.array[index:len(self)]
 
     def _shuffle_left(self, index: int) -> None:
-        """ Shuffle items starting at a given position to the left. """
-        for i in range(index, len(self)):
-            self.array[i] = self.array[i + 1]
+        """ Shuffle items starting at a given position to the left, as one bulk copy. """
+        if index < len(self):
+            self.array[index:len(self)] = self.array[index + 1:len(self) + 1]
 
-    def _resize(self) -> None:
-        """ Resize the list. """
+    def _resize(self, capacity: int = 0) -> None:
+        """ Resize the list, to at least the given capacity. """
         # doubling the size of our list
-        new_array = ArrayR(2 * len(self.array))
+        new_array = ArrayR(max(capacity, 2 * len(self.array)))
 
         # copying the contents
-        for i in range(self.length):
-            new_array[i] = self.array[i]
+        new_array[:self.length] = self.array[:self.length]
 
         # referring to the new array
         self.array = new_array
@@ -109,6 +134,52 @@ class ArraySortedList(SortedList[T]):
         self[position] = item
         self.length += 1
 
+    def add_many(self, items: ArrayR[ListItem]) -> None:
+        """
+        Add every item to the list, each after the items already there with the same key.
+
+        The batch is sorted, then merged with the list: for each new item, the run of current items
+        going before it is found by galloping from where the previous one went, and copied over
+        as a slice.
+        :complexity: O(k log k) to sort the k new items, plus O(k log(n/k)) comparisons and O(n + k) copying.
+        """
+        batch = merge_sort_items(items)
+        k, n = len(batch), len(self)
+        if k == 0:
+            return
+        current = self.array[:n].to_list()
+        merged = []
+        pos = 0
+        for i in range(k):
+            item = batch[i]
+            end = self._gallop(current, item.key, pos)
+            merged.extend(current[pos:end])
+            merged.append(item)
+            pos = end
+        merged.extend(current[pos:])
+
+        if n + k > len(self.array):
+            self._resize(n + k)
+        self.array[:n + k] = merged
+        self.length = n + k
+
+    @staticmethod
+    def _gallop(items: list[ListItem], key: K, start: int) -> int:
+        """ First position from start whose key is greater than the given key, searching outwards from start. """
+        lo, hi, step = start, start, 1
+        while hi < len(items) and items[hi].key <= key:
+            lo = hi + 1
+            hi = lo + step - 1
+            step *= 2
+        hi = min(hi, len(items))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if items[mid].key <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
     def _index_to_add(self, item: ListItem) -> int:
         """ Find the position where the new item should be placed. """
         low = 0
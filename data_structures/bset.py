@@ -3,6 +3,8 @@
 """
 
 from __future__ import annotations
+from typing import Iterable, Iterator
+
 from data_structures.set_adt import Set
 
 class BSet(Set[int]):
@@ -36,15 +38,45 @@ class BSet(Set[int]):
 
     def __len__(self) -> int:
         """
-        Size computation. The most expensive operation.
-        Use int.bit_length(your_integer) to calculate the bit length.
+        Size computation, by counting the set bits.
+        :complexity: O(w) where w is the number of machine words in elems.
+        """
+        return self.elems.bit_count()
+
+    def __iter__(self) -> Iterator[int]:
+        """ Iterates over the elements in increasing order, extracting the lowest set bit each time.
+        :complexity: O(w) per element
         """
-        res = 0
-        for item in range(1, int.bit_length(self.elems) + 1):
-            if item in self:
-                res += 1
+        bits = self.elems
+        while bits:
+            lowest = bits & -bits
+            yield lowest.bit_length()
+            bits ^= lowest
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[int]) -> BSet:
+        """ Creates a set with the given elements, setting their bits in a byte buffer first.
+        :complexity: O(n + m) where n is the number of items and m the largest of them.
+        :raises TypeError: if an item is not integer or if not positive.
+        """
+        items = list(items)
+        positions = [item - 1 for item in items if isinstance(item, int) and item > 0]
+        if len(positions) != len(items):
+            raise TypeError('Set elements should be integers')
+        res = cls()
+        if positions:
+            buffer = bytearray(max(positions) // 8 + 1)
+            for position in positions:
+                buffer[position >> 3] |= 1 << (position & 7)
+            res.elems = int.from_bytes(buffer, "little")
         return res
 
+    def to_list(self) -> list[int]:
+        """ Returns the elements in increasing order.
+        :complexity: O(w) per element
+        """
+        return list(self)
+
     def add(self, item: int) -> None:
         """ Adds an element to the set.
         :raises TypeError: if the item is not integer or if not positive.
@@ -91,23 +123,46 @@ class BSet(Set[int]):
         res.elems = self.elems & ~other.elems
         return res
 
+    def symmetric_difference(self, other: BSet[int]) -> BSet[int]:
+        """ Creates a new set equal to the symmetric difference with another one,
+        i.e. the result set should contain the elements that are in exactly
+        one of self and other.
+        """
+        res = BSet()
+        res.elems = self.elems ^ other.elems
+        return res
+
     def __and__(self, other: BSet):
         return self.intersection(other)
 
     def __or__(self, other: BSet):
         return self.union(other)
 
+    def __sub__(self, other: BSet):
+        return self.difference(other)
+
+    def __xor__(self, other: BSet):
+        return self.symmetric_difference(other)
+
+    def __iand__(self, other: BSet):
+        self.elems &= other.elems
+        return self
+
+    def __ior__(self, other: BSet):
+        self.elems |= other.elems
+        return self
+
+    def __isub__(self, other: BSet):
+        self.elems &= ~other.elems
+        return self
+
+    def __ixor__(self, other: BSet):
+        self.elems ^= other.elems
+        return self
+
     def __str__(self):
         """ Construct a nice string representation. """
-        bit_elems = self.elems
-        out_elems = []
-        current = 0
-        while bit_elems:
-            if bit_elems & (1 << current):
-                out_elems.append(str(current+1))
-                bit_elems &= ~(1 << current)
-            current += 1
-        return '{' + ', '.join(out_elems) + '}'
+        return '{' + ', '.join(map(str, self)) + '}'
 
 if __name__ == '__main__':
     s = BSet(3)
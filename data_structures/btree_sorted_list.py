@@ -0,0 +1,305 @@
+"""
+    B-tree based implementation of SortedList ADT.
+    Items to store should be of type ListItem.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Iterator
+
+from data_structures.array_sorted_list import merge_sort_items
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import *
+
+__docformat__ = 'reStructuredText'
+
+
+class _Node:
+    """
+    A node of the tree. Leaves hold the items and their keys, and are linked left to right.
+    Internal nodes hold their children, the smallest key under each child, and how many
+    items are under each child.
+    """
+    __slots__ = ("keys", "entries", "sizes", "next")
+
+    def __init__(self, keys: list, entries: list, sizes: list[int] | None = None) -> None:
+        self.keys = keys
+        self.entries = entries
+        self.sizes = sizes
+        self.next: _Node | None = None
+
+    def is_leaf(self) -> bool:
+        return self.sizes is None
+
+    def size(self) -> int:
+        return len(self.entries) if self.sizes is None else sum(self.sizes)
+
+
+class BTreeSortedList(SortedList[T]):
+    """
+    SortedList ADT implemented with a B+-tree counting the items under every node, so items are
+    found by key or by position in O(log n) node visits.
+
+    Items with equal keys are kept in the order they were added.
+    Nodes hold up to LEAF_CAPACITY items or BRANCH_CAPACITY children, and are merged with a
+    neighbour once they drop under a quarter of that.
+    """
+    LEAF_CAPACITY = 128
+    BRANCH_CAPACITY = 64
+
+    def __init__(self, max_capacity: int = 0) -> None:
+        """ BTreeSortedList object initialiser. The capacity is only taken for compatibility with ArraySortedList. """
+        SortedList.__init__(self)
+        self.root = _Node([], [])
+
+    def reset(self) -> None:
+        """ Reset the list. """
+        self.clear()
+
+    def clear(self) -> None:
+        """ Clear the list. """
+        SortedList.__init__(self)
+        self.root = _Node([], [])
+
+    def _locate(self, index: int, inserting: bool = False) -> tuple[list[tuple[_Node, int]], _Node, int]:
+        """
+        Returns the path of (node, child position) from the root, the leaf and the position in it
+        of the item at the given index. When inserting, index may also be the length of the list.
+        :complexity: O(B log n) where B is the branching factor.
+        """
+        if not (0 <= index < len(self) or (inserting and index == len(self))):
+            raise IndexError('No such index in the list')
+        path = []
+        node = self.root
+        while not node.is_leaf():
+            last = len(node.sizes) - 1
+            for j in range(last + 1):
+                size = node.sizes[j]
+                if index < size or (j == last):
+                    break
+                index -= size
+            path.append((node, j))
+            node = node.entries[j]
+        return path, node, index
+
+    def __getitem__(self, index: int) -> ListItem:
+        """ Magic method. Return the element at a given position.
+        :complexity: O(B log n)
+        """
+        _, leaf, position = self._locate(index)
+        return leaf.entries[position]
+
+    def __setitem__(self, index: int, item: ListItem) -> None:
+        """ Magic method. Insert the item at a given position,
+            if possible (!). Shift the following elements to the right.
+        :complexity: O(B log n)
+        """
+        if (index > 0 and self[index - 1].key > item.key) or (index < len(self) and item.key > self[index].key):
+            raise IndexError('Element should be inserted in sorted order')
+        self._insert_at(index, item)
+
+    def _insert_at(self, index: int, item: ListItem) -> None:
+        path, leaf, position = self._locate(index, inserting=True)
+        leaf.entries.insert(position, item)
+        leaf.keys.insert(position, item.key)
+        for node, j in path:
+            node.sizes[j] += 1
+        self.length += 1
+        if position == 0:
+            self._refresh_min(path, leaf)
+        if len(leaf.entries) > self.LEAF_CAPACITY:
+            self._split(path, leaf)
+
+    def _refresh_min(self, path: list[tuple[_Node, int]], node: _Node) -> None:
+        """ Update the smallest key recorded for node in its ancestors. """
+        for parent, j in reversed(path):
+            if not node.keys:
+                return
+            parent.keys[j] = node.keys[0]
+            if j != 0:
+                return
+            node = parent
+
+    def _split(self, path: list[tuple[_Node, int]], node: _Node) -> None:
+        """ Split an overfull node in two halves, splitting its ancestors as needed. """
+        half = len(node.entries) // 2
+        sibling = _Node(node.keys[half:], node.entries[half:], None if node.is_leaf() else node.sizes[half:])
+        del node.keys[half:], node.entries[half:]
+        if node.is_leaf():
+            sibling.next, node.next = node.next, sibling
+        else:
+            del node.sizes[half:]
+
+        if not path:
+            self.root = _Node([node.keys[0], sibling.keys[0]], [node, sibling], [node.size(), sibling.size()])
+            return
+        parent, j = path[-1]
+        parent.entries.insert(j + 1, sibling)
+        parent.keys.insert(j + 1, sibling.keys[0])
+        parent.sizes[j] -= sibling.size()
+        parent.sizes.insert(j + 1, sibling.size())
+        if len(parent.entries) > self.BRANCH_CAPACITY:
+            self._split(path[:-1], parent)
+
+    def delete_at_index(self, index: int) -> ListItem:
+        """ Delete item at a given position.
+        :complexity: O(B log n)
+        """
+        path, leaf, position = self._locate(index)
+        item = leaf.entries.pop(position)
+        leaf.keys.pop(position)
+        for node, j in path:
+            node.sizes[j] -= 1
+        self.length -= 1
+        if position == 0:
+            self._refresh_min(path, leaf)
+        if len(leaf.entries) < self.LEAF_CAPACITY // 4:
+            self._rebalance(path, leaf)
+        return item
+
+    def _rebalance(self, path: list[tuple[_Node, int]], node: _Node) -> None:
+        """ Merge an underfull node with a neighbour, splitting the result again if it is too big. """
+        if not path:
+            # Drop roots with a single child.
+            while not self.root.is_leaf() and len(self.root.entries) == 1:
+                self.root = self.root.entries[0]
+            return
+        parent, j = path[-1]
+        if len(parent.entries) == 1:
+            self._rebalance(path[:-1], parent)
+            return
+        left_index = j - 1 if j > 0 else j
+        left, right = parent.entries[left_index], parent.entries[left_index + 1]
+        left.keys += right.keys
+        left.entries += right.entries
+        if left.is_leaf():
+            left.next = right.next
+        else:
+            left.sizes += right.sizes
+        parent.sizes[left_index] += parent.sizes[left_index + 1]
+        del parent.entries[left_index + 1], parent.keys[left_index + 1], parent.sizes[left_index + 1]
+        left_path = path[:-1] + [(parent, left_index)]
+        self._refresh_min(left_path, left)
+
+        capacity = self.LEAF_CAPACITY if left.is_leaf() else self.BRANCH_CAPACITY
+        if len(left.entries) > capacity:
+            self._split(left_path, left)
+        elif len(parent.entries) < self.BRANCH_CAPACITY // 4 or len(parent.entries) == 1:
+            self._rebalance(path[:-1], parent)
+
+    def rank(self, key: K) -> int:
+        """
+        Returns the number of items with a key smaller than the given key.
+        :complexity: O(B log n)
+        """
+        return self._rank(key, bisect_left)
+
+    def _rank_after(self, key: K) -> int:
+        """ Returns the number of items with a key smaller than or equal to the given key. """
+        return self._rank(key, bisect_right)
+
+    def _rank(self, key: K, bisect) -> int:
+        node = self.root
+        res = 0
+        while not node.is_leaf():
+            j = max(0, bisect(node.keys, key) - 1)
+            res += sum(node.sizes[:j])
+            node = node.entries[j]
+        return res + bisect(node.keys, key)
+
+    def add(self, item: ListItem) -> None:
+        """ Add new element to the list, after the items with the same key.
+        :complexity: O(B log n)
+        """
+        self._insert_at(self._rank_after(item.key), item)
+
+    def add_many(self, items: ArrayR[ListItem]) -> None:
+        """
+        Add every item to the list. An empty list is built bottom up from the sorted items.
+        :complexity: O(k log k) to sort the k new items (O(k) if they are in order already),
+        then O(k) for an empty list or O(k B log n) otherwise.
+        """
+        entries = items.to_list()
+        if any(entries[i].key > entries[i + 1].key for i in range(len(entries) - 1)):
+            entries = merge_sort_items(items).to_list()
+        if not self.is_empty():
+            for item in entries:
+                self.add(item)
+            return
+        if not entries:
+            return
+
+        # Fill nodes to three quarters, leaving room to grow before splitting.
+        leaf_size = self.LEAF_CAPACITY * 3 // 4
+        nodes = []
+        for lo in range(0, len(entries), leaf_size):
+            chunk = entries[lo:lo + leaf_size]
+            nodes.append(_Node([item.key for item in chunk], chunk))
+        for a, b in zip(nodes, nodes[1:]):
+            a.next = b
+        branch_size = self.BRANCH_CAPACITY * 3 // 4
+        while len(nodes) > 1:
+            nodes = [
+                _Node([child.keys[0] for child in group], group, [child.size() for child in group])
+                for group in (nodes[lo:lo + branch_size] for lo in range(0, len(nodes), branch_size))
+            ]
+        self.root = nodes[0]
+        self.length = len(entries)
+
+    def index(self, item: ListItem) -> int:
+        """ Find the position of a given item in the list.
+        :complexity: O(B log n + d) where d is the number of items with the same key.
+        """
+        position = self.rank(item.key)
+        if position < len(self):
+            _, leaf, offset = self._locate(position)
+            while leaf is not None and offset < len(leaf.entries) and leaf.keys[offset] == item.key:
+                if leaf.entries[offset] == item:
+                    return position
+                position += 1
+                offset += 1
+                if offset == len(leaf.entries):
+                    leaf, offset = leaf.next, 0
+        raise ValueError('item not in list')
+
+    def __contains__(self, item: ListItem) -> bool:
+        """ Checks if value is in the list. """
+        try:
+            self.index(item)
+            return True
+        except ValueError:
+            return False
+
+    def __iter__(self) -> Iterator[ListItem]:
+        """ Iterates over the items in order.
+        :complexity: O(1) amortised per item
+        """
+        node = self.root
+        while not node.is_leaf():
+            node = node.entries[0]
+        while node is not None:
+            yield from node.entries
+            node = node.next
+
+    def count_between(self, low: K, high: K) -> int:
+        """
+        Returns the number of items with low <= key < high.
+        :complexity: O(B log n)
+        """
+        return max(0, self.rank(high) - self.rank(low))
+
+    def items_between(self, low: K, high: K) -> ArrayR[ListItem]:
+        """
+        Returns the items with low <= key < high, in order.
+        :complexity: O(B log n + k) where k is the number of items returned.
+        """
+        start = self.rank(low)
+        count = max(0, self.rank(high) - start)
+        res = []
+        if count > 0:
+            _, leaf, offset = self._locate(start)
+            while len(res) < count:
+                take = min(count - len(res), len(leaf.entries) - offset)
+                res.extend(leaf.entries[offset:offset + take])
+                leaf, offset = leaf.next, 0
+        return ArrayR.from_list(res)
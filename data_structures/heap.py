@@ -0,0 +1,310 @@
+""" Heap ADT and an array implementation.
+
+Defines a generic abstract heap (a priority queue) with the usual methods,
+and implements a binary min-heap of ListItems using arrays, ordered by key.
+Also defines UnitTests for the class.
+"""
+__docformat__ = 'reStructuredText'
+
+import unittest
+from abc import ABC, abstractmethod
+from typing import Generic, Iterable, Optional
+from data_structures.referential_array import ArrayR, T
+from data_structures.sorted_list_adt import ListItem, K
+
+class Heap(ABC, Generic[T]):
+    """ Abstract class for a generic Heap. """
+
+    def __init__(self) -> None:
+        self.length = 0
+
+    @abstractmethod
+    def push(self, item: T) -> None:
+        """ Adds an element to the heap. """
+        pass
+
+    @abstractmethod
+    def pop(self) -> T:
+        """ Deletes and returns the element at the top of the heap. """
+        pass
+
+    @abstractmethod
+    def peek(self) -> T:
+        """ Returns the element at the top of the heap. """
+        pass
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the heap. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """ True if the heap is empty. """
+        return len(self) == 0
+
+    @abstractmethod
+    def is_full(self) -> bool:
+        """ True if the heap is full and no element can be pushed. """
+        pass
+
+    def clear(self):
+        """ Clears all elements from the heap. """
+        self.length = 0
+
+
+class ArrayHeap(Heap[ListItem]):
+    """ Binary min-heap of ListItems implemented with arrays: the item with the smallest key is at the top.
+    For largest first, use negated keys.
+
+    With a bound, the heap keeps the `bound` items with the largest keys pushed so far (top-k):
+    once full, a new item replaces the top if its key is larger, and is dropped otherwise.
+
+    Attributes:
+         length (int): number of elements in the heap (inherited)
+         array (ArrayR[ListItem]): array storing the elements, the children of position i being at 2i+1 and 2i+2
+         positions (dict[int, int]): position in array of every item, by id, for decrease_key
+         bound (int | None): number of items kept in top-k mode
+
+    ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, max_capacity: int, bound: Optional[int] = None) -> None:
+        """ Initialises the heap with the given capacity, which is the bound in top-k mode.
+        :raises ValueError: if the bound is not positive.
+        """
+        Heap.__init__(self)
+        if bound is not None:
+            if bound <= 0:
+                raise ValueError("bound should be positive.")
+            max_capacity = bound
+        self.bound = bound
+        self.array: ArrayR[ListItem] = ArrayR(max(self.MIN_CAPACITY, max_capacity))
+        self.positions: dict[int, int] = {}
+
+    def clear(self) -> None:
+        """ Clears all elements from the heap. """
+        Heap.__init__(self)
+        self.positions = {}
+
+    def is_full(self) -> bool:
+        """ True if the heap is full. A bounded heap still takes items with larger keys than its top. """
+        return len(self) == len(self.array)
+
+    def __contains__(self, item: ListItem) -> bool:
+        """ True if this very item is in the heap.
+        :complexity: O(1)
+        """
+        return id(item) in self.positions
+
+    def push(self, item: ListItem) -> Optional[ListItem]:
+        """ Adds an item to the heap.
+        In top-k mode, returns the item that was dropped to make room, if any (possibly the new one).
+        :complexity: O(log n)
+        :raises Exception: if the heap is full (and not bounded)
+        :raises ValueError: if the item is already in the heap
+        """
+        if item in self:
+            raise ValueError("Item already in heap")
+        if self.is_full():
+            if self.bound is None:
+                raise Exception("Heap is full")
+            top = self.array[0]
+            if item.key <= top.key:
+                return item
+            del self.positions[id(top)]
+            self._place(item, 0)
+            self._sift_down(0)
+            return top
+        self.length += 1
+        self._place(item, self.length - 1)
+        self._sift_up(self.length - 1)
+        return None
+
+    def pop(self) -> ListItem:
+        """ Deletes and returns the item with the smallest key.
+        :complexity: O(log n)
+        :raises Exception: if the heap is empty
+        """
+        if self.is_empty():
+            raise Exception("Heap is empty")
+        top = self.array[0]
+        del self.positions[id(top)]
+        self.length -= 1
+        if self.length > 0:
+            self._place(self.array[self.length], 0)
+            self._sift_down(0)
+        return top
+
+    def peek(self) -> ListItem:
+        """ Returns the item with the smallest key, without popping it.
+        :complexity: O(1)
+        :raises Exception: if the heap is empty
+        """
+        if self.is_empty():
+            raise Exception("Heap is empty")
+        return self.array[0]
+
+    def decrease_key(self, item: ListItem, key: K) -> None:
+        """ Lowers the key of an item in the heap, moving it up to its new place.
+        :complexity: O(log n)
+        :raises KeyError: if the item is not in the heap
+        :raises ValueError: if the new key is larger than the current one
+        """
+        if item not in self:
+            raise KeyError(item)
+        if key > item.key:
+            raise ValueError("New key is larger than the current one")
+        item.key = key
+        self._sift_up(self.positions[id(item)])
+
+    def heapify(self, items: Iterable[ListItem]) -> None:
+        """ Replaces the contents of the heap with the given items.
+        Builds the heap bottom up by sifting down every parent, from the last one.
+        In top-k mode, the first `bound` items are heapified and the rest pushed.
+        :complexity: O(n), or O(n log k) in top-k mode
+        :raises Exception: if there are more items than the capacity (and the heap is not bounded)
+        :raises ValueError: if an item appears twice
+        """
+        items = items.to_list() if isinstance(items, ArrayR) else list(items)
+        rest = []
+        if self.bound is not None:
+            items, rest = items[:self.bound], items[self.bound:]
+        elif len(items) > len(self.array):
+            raise Exception("Heap is full")
+        positions = {id(item): i for i, item in enumerate(items)}
+        if len(positions) != len(items):
+            raise ValueError("Item already in heap")
+
+        self.array[:len(items)] = items
+        self.positions = positions
+        self.length = len(items)
+        for i in range(len(items) // 2 - 1, -1, -1):
+            self._sift_down(i)
+        for item in rest:
+            self.push(item)
+
+    def ranked(self) -> ArrayR[ListItem]:
+        """ Returns the items from the largest key to the smallest, leaving the heap unchanged.
+        Pops every item from a copy of the heap, smallest first, into the end of the result.
+        :complexity: O(n log n), so O(k log k) for a top-k heap
+        """
+        if self.is_empty():
+            return ArrayR.from_list([])
+        res = ArrayR(self.length)
+        heap = ArrayHeap(0)
+        heap.array, heap.length, heap.positions = self.array.copy(), self.length, dict(self.positions)
+        for i in range(self.length - 1, -1, -1):
+            res[i] = heap.pop()
+        return res
+
+    def _place(self, item: ListItem, position: int) -> None:
+        self.array[position] = item
+        self.positions[id(item)] = position
+
+    def _sift_up(self, position: int) -> None:
+        """ Moves the item at position up while its key is smaller than its parent's. """
+        item = self.array[position]
+        while position > 0:
+            parent = (position - 1) // 2
+            if not item.key < self.array[parent].key:
+                break
+            self._place(self.array[parent], position)
+            position = parent
+        self._place(item, position)
+
+    def _sift_down(self, position: int) -> None:
+        """ Moves the item at position down while a child has a smaller key. """
+        item = self.array[position]
+        while True:
+            child = 2 * position + 1
+            if child >= self.length:
+                break
+            if child + 1 < self.length and self.array[child + 1].key < self.array[child].key:
+                child += 1
+            if not self.array[child].key < item.key:
+                break
+            self._place(self.array[child], position)
+            position = child
+        self._place(item, position)
+
+
+class TestHeap(unittest.TestCase):
+    """ Tests for the above class."""
+    EMPTY = 0
+    ROOMY = 5
+    LARGE = 10
+    CAPACITY = 20
+
+    def setUp(self):
+        self.lengths = [self.EMPTY, self.ROOMY, self.LARGE, self.ROOMY, self.LARGE]
+        self.heaps = [ArrayHeap(self.CAPACITY) for i in range(len(self.lengths))]
+        for heap, length in zip(self.heaps, self.lengths):
+            for i in range(length):
+                heap.push(ListItem(i, (7 * i) % length))
+        self.empty_heap = self.heaps[0]
+        self.roomy_heap = self.heaps[1]
+        self.large_heap = self.heaps[2]
+        #we build empty heaps from clear.
+        self.clear_heap = self.heaps[3]
+        self.clear_heap.clear()
+        self.lengths[3] = 0
+        self.heaps[4].clear()
+        self.lengths[4] = 0
+
+    def tearDown(self):
+        for h in self.heaps:
+            h.clear()
+
+    def test_init(self):
+        self.assertTrue(self.empty_heap.is_empty())
+        self.assertEqual(len(self.empty_heap), 0)
+
+    def test_len(self):
+        """ Tests the length of all heaps created during setup."""
+        for heap, length in zip(self.heaps, self.lengths):
+            self.assertEqual(len(heap), length)
+
+    def test_is_empty_add(self):
+        """ Tests heaps that have been created empty/non-empty."""
+        self.assertTrue(self.empty_heap.is_empty())
+        self.assertFalse(self.roomy_heap.is_empty())
+        self.assertFalse(self.large_heap.is_empty())
+
+    def test_is_empty_pop(self):
+        """ Tests heaps that have been popped completely."""
+        for heap in self.heaps:
+            #we empty the heap
+            try:
+                while True:
+                    was_empty = heap.is_empty()
+                    heap.pop()
+                    self.assertFalse(was_empty)
+            except:
+                self.assertTrue(heap.is_empty())
+
+    def test_is_full_add(self):
+        """ Tests heaps that have been created not full."""
+        self.assertFalse(self.empty_heap.is_full())
+        self.assertFalse(self.roomy_heap.is_full())
+        self.assertFalse(self.large_heap.is_full())
+
+    def test_push_and_pop(self):
+        """ Pops come out in increasing key order."""
+        for heap in self.heaps:
+            keys = [heap.pop().key for _ in range(len(heap))]
+            self.assertListEqual(keys, sorted(keys))
+            for key in (4, 1, 3, 1, 0):
+                heap.push(ListItem(key, key))
+            self.assertEqual(heap.peek().key, 0)
+            self.assertListEqual([heap.pop().key for _ in range(5)], [0, 1, 1, 3, 4])
+
+    def test_clear(self):
+        for heap in self.heaps:
+            heap.clear()
+            self.assertEqual(len(heap), 0)
+            self.assertTrue(heap.is_empty())
+
+if __name__ == '__main__':
+    testtorun = TestHeap()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -8,7 +8,7 @@ __docformat__ = 'reStructuredText'
 
 import unittest
 from abc import ABC, abstractmethod
-from typing import Generic
+from typing import Generic, Iterable
 from data_structures.referential_array import ArrayR, T
 
 class Queue(ABC, Generic[T]):
@@ -110,6 +110,103 @@ class CircularQueue(Queue[T]):
         self.front = 0
         self.rear = 0
 
+    def extend(self, items: Iterable[T]) -> None:
+        """ Adds the elements to the rear of the queue, in order, copying them in at most two slices.
+        :complexity: O(k) where k is the number of elements
+        :pre: queue has room for all the elements
+        :raises Exception: if the queue doesn't have room for all of them, leaving it unchanged
+        """
+        items = items.to_list() if isinstance(items, ArrayR) else list(items)
+        self._make_room(len(items))
+        capacity = len(self.array)
+        first = min(len(items), capacity - self.rear)
+        self.array[self.rear:self.rear + first] = items[:first]
+        self.array[0:len(items) - first] = items[first:]
+        self.rear = (self.rear + len(items)) % capacity
+        self.length += len(items)
+
+    def serve_many(self, k: int) -> ArrayR[T]:
+        """ Deletes and returns the k elements at the queue's front, front first.
+        :complexity: O(k)
+        :pre: queue has at least k elements
+        :raises ValueError: if k is negative
+        :raises Exception: if the queue has fewer than k elements, leaving it unchanged
+        """
+        if k < 0:
+            raise ValueError(f"k should be non-negative, got {k}.")
+        if k > len(self):
+            raise Exception("Queue is empty")
+        capacity = len(self.array)
+        first = min(k, capacity - self.front)
+        res = self.array[self.front:self.front + first].to_list() + self.array[:k - first].to_list()
+        self.front = (self.front + k) % capacity
+        self.length -= k
+        return ArrayR.from_list(res)
+
+    def _make_room(self, k: int) -> None:
+        """ Makes sure k more elements fit.
+        :raises Exception: if they don't
+        """
+        if len(self) + k > len(self.array):
+            raise Exception("Queue is full")
+
+
+class GrowableCircularQueue(CircularQueue[T]):
+    """ Circular queue that is never full: it doubles its array when it runs out of room, and halves
+    it when it is less than a quarter full, never going under the initial capacity.
+    Appending and serving take amortised O(1) time.
+    """
+
+    def __init__(self, max_capacity: int = 1) -> None:
+        CircularQueue.__init__(self, max_capacity)
+        self.min_capacity = len(self.array)
+
+    def append(self, item: T) -> None:
+        """ Adds an element to the rear of the queue, growing it if needed.
+        :complexity: amortised O(1)
+        """
+        self._make_room(1)
+        CircularQueue.append(self, item)
+
+    def serve(self) -> T:
+        """ Deletes and returns the element at the queue's front, shrinking the queue if sparse.
+        :complexity: amortised O(1)
+        :raises Exception: if the queue is empty
+        """
+        item = CircularQueue.serve(self)
+        self._shrink()
+        return item
+
+    def serve_many(self, k: int) -> ArrayR[T]:
+        res = CircularQueue.serve_many(self, k)
+        self._shrink()
+        return res
+
+    def is_full(self) -> bool:
+        """ A growable queue is never full. """
+        return False
+
+    def _make_room(self, k: int) -> None:
+        if len(self) + k > len(self.array):
+            self._resize(max(2 * len(self.array), len(self) + k))
+
+    def _shrink(self) -> None:
+        """ Halves the capacity until the elements fill at least a quarter of it (or it reaches min_capacity), resizing once. """
+        capacity = len(self.array)
+        while len(self) < capacity // 4 and capacity // 2 >= self.min_capacity:
+            capacity //= 2
+        if capacity != len(self.array):
+            self._resize(capacity)
+
+    def _resize(self, capacity: int) -> None:
+        """ Moves the elements to a new array of the given capacity, unwrapping them so the front is at 0. """
+        items = self.array.to_list()
+        first = min(len(self), len(items) - self.front)
+        elements = items[self.front:self.front + first] + items[:len(self) - first]
+        self.array = ArrayR.from_list(elements + [None] * (capacity - len(elements)))
+        self.front = 0
+        self.rear = len(self) % capacity
+
 
 class TestQueue(unittest.TestCase):
     """ Tests for the above class."""
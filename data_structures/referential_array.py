@@ -22,7 +22,7 @@ Modified by Jackson Goerner
 __docformat__ = "reStructuredText"
 
 from ctypes import py_object
-from typing import TypeVar, Generic
+from typing import Iterable, Iterator, TypeVar, Generic
 
 T = TypeVar("T")
 
@@ -36,7 +36,17 @@ class ArrayR(Generic[T]):
         if length < 0:
             raise ValueError("Array length should be larger than or equal to 0.")
         self.array = (length * py_object)()  # initialises the space
-        self.array[:] = [None for _ in range(length)]
+        self.array[:] = [None] * length
+
+    @classmethod
+    def _from_owned_list(cls, items: list[T]) -> ArrayR[T]:
+        """Returns an array with the objects in items, without filling it with None first.
+        :complexity: O(n), as a single slice assignment
+        """
+        ret = cls.__new__(cls)
+        ret.array = (len(items) * py_object)()
+        ret.array[:] = items
+        return ret
 
     def __len__(self) -> int:
         """Returns the length of the array
@@ -44,45 +54,75 @@ class ArrayR(Generic[T]):
         """
         return len(self.array)
 
-    def __getitem__(self, index: int) -> T:
-        """Returns the object in position index.
-        :complexity: O(1)
+    def __getitem__(self, index: int | slice) -> T | ArrayR[T]:
+        """Returns the object in position index, or a new array of the objects in a slice.
+        :complexity: O(1) for an index, O(k) for a slice of k elements
         :pre: index in between 0 and length - self.array[] checks it
         """
+        if index.__class__ is slice:
+            return ArrayR._from_owned_list(self.array[index])
         return self.array[index]
 
-    def __setitem__(self, index: int, value: T) -> None:
-        """Sets the object in position index to value
-        :complexity: O(1)
+    def __setitem__(self, index: int | slice, value: T | Iterable[T]) -> None:
+        """Sets the object in position index to value, or the objects in a slice to those in value.
+        :complexity: O(1) for an index, O(k) for a slice of k elements
         :pre: index in between 0 and length - self.array[] checks it
+        :raises ValueError: if value doesn't have as many objects as the slice.
+        """
+        if index.__class__ is not slice:
+            self.array[index] = value
+            return
+        items = value.to_list() if isinstance(value, ArrayR) else list(value)
+        start, stop, step = index.indices(len(self.array))
+        if len(items) != len(range(start, stop, step)):
+            raise ValueError("Can only assign a sequence of the same size as the slice.")
+        self.array[index] = items
+
+    def __iter__(self) -> Iterator[T]:
+        """Iterates over the objects in order, as they were when iteration started.
+        :complexity: O(n) to take them all in bulk, then O(1) per object
         """
-        self.array[index] = value
+        return iter(self.array[:])
+
+    def __reduce__(self):
+        """Pickles the array by its contents, as ctypes arrays of py_object cannot be pickled."""
+        return ArrayR.from_list, (self.to_list(),)
 
-    def index(self, item: T) -> T:
-        for index, arr_item in enumerate(self.array):
-            if arr_item == item:
-                return index
-        else:
+    def index(self, item: T) -> int:
+        """Returns the position of the first object equal to item.
+        :complexity: O(n)
+        :raises ValueError: if no object is equal to item.
+        """
+        try:
+            return self.array[:].index(item)
+        except ValueError:
             raise ValueError("Value does not exist")
 
     def __str__(self) -> str:
-        ret_str = "["
-        for i, item in enumerate(self.array):
-            ret_str += str(item)
-            ret_str += ", "
+        return "[" + ", ".join(map(str, self.array[:])) + "]"
+
+    def copy(self) -> ArrayR[T]:
+        """Returns a new array with the same objects.
+        :complexity: O(n), as a single slice assignment
+        """
+        return ArrayR._from_owned_list(self.array[:])
 
-        ret_str = ret_str[:-2] + "]"
-        return ret_str
+    def extend(self, items: Iterable[T]) -> None:
+        """Grows the array to hold the given objects after its own.
+        :complexity: O(n + k) where k is the number of new objects
+        """
+        extra = items.to_list() if isinstance(items, ArrayR) else list(items)
+        self.array = ArrayR._from_owned_list(self.array[:] + extra).array
 
     @classmethod
     def from_list(cls, l: list[T]) -> ArrayR[T]:
-        ret = ArrayR(len(l))
-        for x in range(len(l)):
-            ret[x] = l[x]
-        return ret
+        """Returns a new array with the objects in l.
+        :complexity: O(n), as a single slice assignment
+        """
+        return cls._from_owned_list(list(l))
 
     def to_list(self) -> list[T]:
-        ret = []
-        for x in range(len(self)):
-            ret.append(self[x])
-        return ret
+        """Returns a list of the objects in the array.
+        :complexity: O(n)
+        """
+        return self.array[:]
@@ -8,7 +8,7 @@ __docformat__ = 'reStructuredText'
 
 import unittest
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterable
 from data_structures.referential_array import ArrayR, T
 
 class Stack(ABC, Generic[T]):
@@ -99,6 +99,93 @@ class ArrayStack(Stack[T]):
             raise Exception("Stack is empty")
         return self.array[self.length-1]
 
+    def extend(self, items: Iterable[T]) -> None:
+        """ Pushes the elements in order, so the last one ends up at the top, as one slice copy.
+        :complexity: O(k) where k is the number of elements
+        :pre: stack has room for all the elements
+        :raises Exception: if the stack doesn't have room for all of them, leaving it unchanged
+        """
+        items = items.to_list() if isinstance(items, ArrayR) else list(items)
+        self._make_room(len(items))
+        self.array[self.length:self.length + len(items)] = items
+        self.length += len(items)
+
+    def pop_many(self, k: int) -> ArrayR[T]:
+        """ Pops the k elements at the top of the stack, top first.
+        :complexity: O(k)
+        :pre: stack has at least k elements
+        :raises ValueError: if k is negative
+        :raises Exception: if the stack has fewer than k elements, leaving it unchanged
+        """
+        if k < 0:
+            raise ValueError(f"k should be non-negative, got {k}.")
+        if k > len(self):
+            raise Exception("Stack is empty")
+        res = self.array[self.length - k:self.length].to_list()
+        res.reverse()
+        self.length -= k
+        return ArrayR.from_list(res)
+
+    def _make_room(self, k: int) -> None:
+        """ Makes sure k more elements fit.
+        :raises Exception: if they don't
+        """
+        if len(self) + k > len(self.array):
+            raise Exception("Stack is full")
+
+
+class GrowableArrayStack(ArrayStack[T]):
+    """ Array stack that is never full: it doubles its array when it runs out of room, and halves
+    it when it is less than a quarter full, never going under the initial capacity.
+    Pushing and popping take amortised O(1) time.
+    """
+
+    def __init__(self, max_capacity: int = 1) -> None:
+        ArrayStack.__init__(self, max_capacity)
+        self.min_capacity = len(self.array)
+
+    def push(self, item: T) -> None:
+        """ Pushes an element to the top of the stack, growing it if needed.
+        :complexity: amortised O(1)
+        """
+        self._make_room(1)
+        ArrayStack.push(self, item)
+
+    def pop(self) -> T:
+        """ Pops the element at the top of the stack, shrinking the stack if sparse.
+        :complexity: amortised O(1)
+        :raises Exception: if the stack is empty
+        """
+        item = ArrayStack.pop(self)
+        self._shrink()
+        return item
+
+    def pop_many(self, k: int) -> ArrayR[T]:
+        res = ArrayStack.pop_many(self, k)
+        self._shrink()
+        return res
+
+    def is_full(self) -> bool:
+        """ A growable stack is never full. """
+        return False
+
+    def _make_room(self, k: int) -> None:
+        if len(self) + k > len(self.array):
+            self._resize(max(2 * len(self.array), len(self) + k))
+
+    def _shrink(self) -> None:
+        """ Halves the capacity until the elements fill at least a quarter of it (or it reaches min_capacity), resizing once. """
+        capacity = len(self.array)
+        while len(self) < capacity // 4 and capacity // 2 >= self.min_capacity:
+            capacity //= 2
+        if capacity != len(self.array):
+            self._resize(capacity)
+
+    def _resize(self, capacity: int) -> None:
+        """ Moves the elements to a new array of the given capacity. """
+        elements = self.array[:self.length].to_list()
+        self.array = ArrayR.from_list(elements + [None] * (capacity - self.length))
+
 class TestStack(unittest.TestCase):
     """ Tests for the above class."""
     EMPTY = 0
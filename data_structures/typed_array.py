@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+""" Fixed-width numeric arrays with the interface of ArrayR.
+
+ArrayR holds references, so every number in it is a separate Python object somewhere else in
+memory. These arrays instead keep their values unboxed and contiguous in an array.array, which
+also exposes them through the buffer protocol: typed.as_memoryview(), or
+numpy.frombuffer(typed.array, dtype) to share the memory with NumPy without copying.
+memoryview(typed) itself only works from Python 3.12, which added __buffer__ to Python classes.
+"""
+__docformat__ = "reStructuredText"
+
+from array import array
+from typing import Iterable, Iterator, TypeVar, Generic
+
+N = TypeVar("N", int, float)
+
+
+class TypedArray(Generic[N]):
+    """ Base class of the typed arrays, each subclass choosing the array.array typecode. """
+
+    TYPECODE: str = None
+
+    def __init__(self, length: int) -> None:
+        """Creates an array of the given length, initialised to 0
+        :complexity: O(length)
+        """
+        if length < 0:
+            raise ValueError("Array length should be larger than or equal to 0.")
+        self.array = array(self.TYPECODE, bytes(length * array(self.TYPECODE).itemsize))
+
+    @classmethod
+    def _wrap(cls, values: array) -> TypedArray[N]:
+        ret = cls.__new__(cls)
+        ret.array = values
+        return ret
+
+    def __len__(self) -> int:
+        """Returns the length of the array
+        :complexity: O(1)
+        """
+        return len(self.array)
+
+    def __getitem__(self, index: int | slice) -> N | TypedArray[N]:
+        """Returns the value in position index, or a new array of the values in a slice.
+        :complexity: O(1) for an index, O(k) for a slice of k elements
+        """
+        if index.__class__ is slice:
+            return self._wrap(self.array[index])
+        return self.array[index]
+
+    def __setitem__(self, index: int | slice, value: N | Iterable[N]) -> None:
+        """Sets the value in position index, or the values in a slice to those in value.
+        :complexity: O(1) for an index, O(k) for a slice of k elements
+        :raises ValueError: if value doesn't have as many values as the slice.
+        :raises OverflowError: if a value doesn't fit in the array's type.
+        """
+        if index.__class__ is not slice:
+            self.array[index] = value
+            return
+        values = value.array if isinstance(value, TypedArray) and value.TYPECODE == self.TYPECODE else array(self.TYPECODE, value)
+        if len(values) != len(range(*index.indices(len(self.array)))):
+            raise ValueError("Can only assign a sequence of the same size as the slice.")
+        self.array[index] = values
+
+    def __iter__(self) -> Iterator[N]:
+        return iter(self.array)
+
+    def as_memoryview(self) -> memoryview:
+        """Returns a memoryview sharing the values' memory, on any Python version.
+        :complexity: O(1)
+        """
+        return memoryview(self.array)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """Exposes the values through the buffer protocol. Only called from Python 3.12, use as_memoryview before that."""
+        return memoryview(self.array)
+
+    def index(self, item: N) -> int:
+        """Returns the position of the first value equal to item.
+        :complexity: O(n)
+        :raises ValueError: if no value is equal to item.
+        """
+        try:
+            return self.array.index(item)
+        except ValueError:
+            raise ValueError("Value does not exist")
+
+    def __str__(self) -> str:
+        return "[" + ", ".join(map(str, self.array)) + "]"
+
+    def copy(self) -> TypedArray[N]:
+        """Returns a new array with the same values.
+        :complexity: O(n), as a single memory copy
+        """
+        return self._wrap(array(self.TYPECODE, self.array))
+
+    def extend(self, values: Iterable[N]) -> None:
+        """Appends the given values to the array.
+        :complexity: O(k) amortised, where k is the number of new values
+        """
+        self.array.extend(values.array if isinstance(values, TypedArray) and values.TYPECODE == self.TYPECODE else array(self.TYPECODE, values))
+
+    @classmethod
+    def from_list(cls, l: Iterable[N]) -> TypedArray[N]:
+        """Returns a new array with the values in l.
+        :complexity: O(n)
+        :raises OverflowError: if a value doesn't fit in the array's type.
+        """
+        return cls._wrap(array(cls.TYPECODE, l))
+
+    def to_list(self) -> list[N]:
+        """Returns a list of the values in the array.
+        :complexity: O(n)
+        """
+        return self.array.tolist()
+
+
+class Int32Array(TypedArray[int]):
+    """ Array of signed 32 bit integers. """
+    TYPECODE = "i" if array("i").itemsize == 4 else "l"
+
+
+class Int64Array(TypedArray[int]):
+    """ Array of signed 64 bit integers. """
+    TYPECODE = "q"
+
+
+class Float64Array(TypedArray[float]):
+    """ Array of double precision floats. """
+    TYPECODE = "d"
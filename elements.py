@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import math
 from enum import auto
 from typing import Optional
 
 from base_enum import BaseEnum
 
 from data_structures.referential_array import ArrayR
+from data_structures.typed_array import Float64Array
 
 class Element(BaseEnum):
     """
@@ -41,19 +43,25 @@ class Element(BaseEnum):
 
     @classmethod
     def from_string(cls, string: str) -> Element:
-        for elem in Element:
-            if elem.name.lower() == string.lower():
-                return elem
-        raise ValueError(f"Unexpected string {string}")
+        """
+        Returns the element with the given name, ignoring case.
+        :complexity: O(len(string)), a single dictionary lookup.
+        """
+        try:
+            return cls[string.upper()]
+        except KeyError:
+            raise ValueError(f"Unexpected string {string}") from None
 
 class EffectivenessCalculator:
     """
     Helper class for calculating the element effectiveness for two elements.
 
-    This class follows the singleton pattern.
+    The chart loaded from type_effectiveness.csv is kept as a singleton. Other charts can be
+    loaded with from_csv and queried through their instance methods, usually via a Ruleset.
 
     Usage:
         EffectivenessCalculator.get_effectiveness(elem1, elem2)
+        EffectivenessCalculator.from_csv("other_chart.csv").effectiveness(elem1, elem2)
     """
 
     instance: Optional[EffectivenessCalculator] = None
@@ -78,22 +86,60 @@ class EffectivenessCalculator:
         self.element_names = element_names
         self.effectiveness_values = effectiveness_values
 
+        # Re-lay the values out in Element order, so lookups can index by Element.value directly.
+        # Row (attacker.value - 1), column (defender.value - 1). Pairs not in the csv are NaN.
+        n = len(element_names)
+        self.n_elements = len(Element)
+        self.matrix = Float64Array.from_list([math.nan] * (self.n_elements * self.n_elements))
+        values = ArrayR(n)
+        for i in range(n):
+            values[i] = Element.from_string(element_names[i]).value - 1
+        for i in range(n):
+            row = values[i] * self.n_elements
+            for j in range(n):
+                self.matrix[row + values[j]] = effectiveness_values[i * n + j]
+
+    def effectiveness(self, type1: Element, type2: Element) -> float:
+        """
+        Returns the effectivness of elem1 attacking elem2 in this chart.
+        :complexity: O(1)
+        """
+        return self.matrix[(type1.value - 1) * self.n_elements + type2.value - 1]
+
+    def effectiveness_many(self, attackers: ArrayR[int], defenders: ArrayR[int]) -> Float64Array:
+        """
+        Returns the effectiveness of attackers[i] attacking defenders[i] in this chart for every i.
+        Both arrays hold Element values, and should have the same length.
+        :complexity: O(n) where n is the length of the arrays.
+        """
+        if len(attackers) != len(defenders):
+            raise ValueError("attackers and defenders should have the same length.")
+        matrix, n_elements = self.matrix, self.n_elements
+        res = Float64Array(len(attackers))
+        for i in range(len(attackers)):
+            res[i] = matrix[(attackers[i] - 1) * n_elements + defenders[i] - 1]
+        return res
+
     @classmethod
     def get_effectiveness(cls, type1: Element, type2: Element) -> float:
         """
         Returns the effectivness of elem1 attacking elem2.
 
         Example: EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.WATER) == 0.5
+        :complexity: O(1)
         """
+        return cls.instance.effectiveness(type1, type2)
 
-        idx1 = cls.instance.element_names.index(type1.name.title())
-        idx2 = cls.instance.element_names.index(type2.name.title())
-
-        element_names_length = len(cls.instance.element_names)
-
-        new_effectiveness_values = cls.instance.effectiveness_values[idx1*element_names_length:idx1*element_names_length+element_names_length]
+    @classmethod
+    def get_effectiveness_many(cls, attackers: ArrayR[int], defenders: ArrayR[int]) -> Float64Array:
+        """
+        Returns the effectiveness of attackers[i] attacking defenders[i] for every i.
+        Both arrays hold Element values, and should have the same length.
 
-        return new_effectiveness_values[idx2]
+        Example: EffectivenessCalculator.get_effectiveness_many([1, 1], [2, 3]) == [0.5, 2]
+        :complexity: O(n) where n is the length of the arrays.
+        """
+        return cls.instance.effectiveness_many(attackers, defenders)
 
     @classmethod
     def from_csv(cls, csv_file: str) -> EffectivenessCalculator:
@@ -104,11 +150,9 @@ class EffectivenessCalculator:
             header = header.split(",")
             rest = rest.replace("\n", ",").split(",")
             a_header = ArrayR(len(header))
-            a_all = ArrayR(len(rest))
             for i in range(len(header)):
                 a_header[i] = header[i]
-            for i in range(len(rest)):
-                a_all[i] = float(rest[i])
+            a_all = Float64Array.from_list(map(float, rest))
             return EffectivenessCalculator(a_header, a_all)
 
     @classmethod
@@ -1,40 +1,214 @@
 from __future__ import annotations
 import yaml
-from typing import TYPE_CHECKING
+from typing import NamedTuple, Optional, TYPE_CHECKING
 
+from monster_base import MonsterBase
+from data_structures.bset import BSet
 from data_structures.referential_array import ArrayR
 
 if TYPE_CHECKING:
-    from monster_base import MonsterBase
+    from stats import SimpleStats, ComplexStats
 
 
 _monsters: ArrayR[MonsterBase] = None
+_evolution_graph: EvolutionGraph = None
+
+
+class Species(NamedTuple):
+    """
+    Immutable record of everything that is shared by all monsters of one species.
+
+    :id: Index of the species in get_all_monsters()
+    :element_id: The Element value of `element`
+    :evolution: Species id of the evolution, or None if it doesn't evolve.
+    """
+    id: int
+    name: str
+    description: str
+    element: str
+    element_id: int
+    simple_stats: SimpleStats
+    complex_stats: ComplexStats
+    evolution: Optional[int]
+    can_be_spawned: bool
+
+
+class _SpeciesMonster(MonsterBase):
+    """Implements the MonsterBase classmethods by reading the class' species record."""
+
+    __slots__ = ()
+
+    @classmethod
+    def get_name(cls) -> str:
+        return cls.species.name
+
+    @classmethod
+    def get_description(cls) -> str:
+        return cls.species.description
+
+    @classmethod
+    def get_evolution(cls) -> type[MonsterBase]:
+        if cls.species.evolution is None:
+            return None
+        return _monsters[cls.species.evolution]
+
+    @classmethod
+    def get_element(cls) -> str:
+        return cls.species.element
+
+    @classmethod
+    def get_simple_stats(cls) -> SimpleStats:
+        return cls.species.simple_stats
+
+    @classmethod
+    def get_complex_stats(cls) -> ComplexStats:
+        return cls.species.complex_stats
+
+    @classmethod
+    def can_be_spawned(cls) -> bool:
+        return cls.species.can_be_spawned
 
 
-def MonsterBaseFactory(name, description, evolution, element, simple_stats, complex_stats, can_be_spawned) -> type[MonsterBase]:
-    from monster_base import MonsterBase
-    return type(name, (MonsterBase, ), {
-        "get_name": classmethod(lambda s: name),
-        "get_description": classmethod(lambda s: description),
+class EvolutionGraph:
+    """
+    Index over the evolution links of the monster catalogue, built once at load.
+
+    All arrays are indexed by species id (position in get_all_monsters()):
+    :next_id: species id this species evolves into, or None
+    :root: first species of the evolution chain this species belongs to
+    :depth: number of evolutions between the chain root and this species
+    :final_form: last species of the evolution chain this species belongs to
+    """
+
+    def __init__(self, monsters: ArrayR[type[MonsterBase]]) -> None:
+        n = len(monsters)
+        self.monsters = monsters
+        self.next_id: ArrayR[Optional[int]] = ArrayR(n)
+        self.root: ArrayR[int] = ArrayR(n)
+        self.depth: ArrayR[int] = ArrayR(n)
+        self.final_form: ArrayR[int] = ArrayR(n)
+
+        has_parent = ArrayR(n)
+        for i in range(n):
+            has_parent[i] = False
+        for i in range(n):
+            self.next_id[i] = monsters[i].species.evolution
+            if self.next_id[i] is not None:
+                has_parent[self.next_id[i]] = True
+
+        # Walk every chain from its root, then walk it again to fill in the final form.
+        # Several species may evolve into the same one (e.g. Normake), in which case
+        # that species keeps the first root in catalogue order.
+        for i in range(n):
+            if has_parent[i]:
+                continue
+            cur, depth = i, 0
+            # Species seen on this walk, as 1-based ids, to catch chains that run into a cycle.
+            visited = BSet()
+            while True:
+                if cur + 1 in visited:
+                    raise ValueError(f"Evolution cycle through {monsters[cur].get_name()}")
+                visited.add(cur + 1)
+                if self.root[cur] is None:
+                    self.root[cur] = i
+                    self.depth[cur] = depth
+                if self.next_id[cur] is None:
+                    break
+                cur, depth = self.next_id[cur], depth + 1
+            final, cur = cur, i
+            while cur is not None:
+                self.final_form[cur] = final
+                cur = self.next_id[cur]
+
+        for i in range(n):
+            if self.root[i] is None:
+                raise ValueError(f"Evolution cycle through {monsters[i].get_name()}")
+
+    def chain(self, species_id: int) -> ArrayR[int]:
+        """
+        Returns the species ids of the whole evolution chain containing species_id, from root to final form.
+        :complexity: O(chain length)
+        """
+        cur, length = self.root[species_id], 1
+        while self.next_id[cur] is not None:
+            cur, length = self.next_id[cur], length + 1
+        cur = self.root[species_id]
+        res = ArrayR(length)
+        for i in range(length):
+            res[i] = cur
+            cur = self.next_id[cur]
+        return res
+
+    def batch_evolve(
+        self,
+        species_ids: ArrayR[int],
+        levels: ArrayR[int],
+        original_levels: ArrayR[int],
+        hp_differences: ArrayR[int],
+        simple_mode: bool = True,
+    ) -> tuple[ArrayR[int], ArrayR[int], ArrayR[int]]:
+        """
+        Evolve many monsters given as parallel arrays, without instantiating any monster classes.
+
+        Follows the same rules as MonsterBase.ready_to_evolve / evolve: a monster evolves if
+        its species has an evolution and its level differs from its original level, and the
+        evolved monster keeps the same hp difference.
+
+        Returns the new (species_ids, hps, original_levels). Levels and hp differences are unchanged.
+        :complexity: O(n) where n is the number of monsters given.
+        """
+        n = len(species_ids)
+        new_ids, new_hps, new_original_levels = ArrayR(n), ArrayR(n), ArrayR(n)
+        for i in range(n):
+            species_id, level = species_ids[i], levels[i]
+            original_level = original_levels[i]
+            if self.next_id[species_id] is not None and level != original_level:
+                species_id = self.next_id[species_id]
+                original_level = level
+            if simple_mode:
+                max_hp = self.monsters[species_id].species.simple_stats.get_max_hp()
+            else:
+                max_hp = self.monsters[species_id].species.complex_stats.get_max_hp(level)
+            new_ids[i] = species_id
+            new_hps[i] = max_hp - hp_differences[i]
+            new_original_levels[i] = original_level
+        return new_ids, new_hps, new_original_levels
+
+
+def MonsterBaseFactory(name, description, evolution, element, simple_stats, complex_stats, can_be_spawned, species_id=-1) -> type[MonsterBase]:
+    from elements import Element
+    species = Species(
+        species_id,
+        name,
+        description,
+        element,
+        Element.from_string(element).value,
+        simple_stats,
+        complex_stats,
         # This will be defined later when we have all names.
-        "get_evolution": classmethod(lambda s: None),
-        "get_element": classmethod(lambda s: element),
-        "get_simple_stats": classmethod(lambda s: simple_stats),
-        "get_complex_stats": classmethod(lambda s: complex_stats),
-        "can_be_spawned": classmethod(lambda s: can_be_spawned),
-    })
+        None,
+        can_be_spawned,
+    )
+    # __module__ lets pickle find the class again as helpers.<name>, e.g. in worker processes.
+    return type(name, (_SpeciesMonster, ), {"__slots__": (), "species": species, "__module__": __name__})
 
 def get_all_monsters():
     if _monsters is None:
         _make_all_monster_classes()
     return _monsters
 
+def get_evolution_graph() -> EvolutionGraph:
+    if _evolution_graph is None:
+        _make_all_monster_classes()
+    return _evolution_graph
+
 def _make_all_monster_classes():
     from stats import SimpleStats, ComplexStats
-    global _monsters
+    global _monsters, _evolution_graph
     with open("monsters.yaml", "r") as f:
         monsters_yaml = yaml.safe_load(f)
     _monsters = ArrayR(len(monsters_yaml))
+    species_ids = {}
     idx = 0
     for monster in monsters_yaml:
         simple = monster["simple"]
@@ -51,19 +225,21 @@ def _make_all_monster_classes():
                 ArrayR.from_list(str(complex["speed"]).split()),
                 ArrayR.from_list(str(complex["max_hp"]).split()),
             ),
-            monster.get("can_be_spawned", False)
+            monster.get("can_be_spawned", False),
+            species_id=idx,
         )
         globals()[monster["name"]] = new_class
         _monsters[idx] = new_class
+        species_ids[monster["name"]] = idx
         idx += 1
     # Now assign evolution
     for monster in monsters_yaml:
         evolution = monster.get("evolution", None)
         if evolution is None:
             continue
-        evolution_class = globals()[evolution]
-        globals()[monster["name"]].evolution_class = evolution_class
-        globals()[monster["name"]].get_evolution = classmethod(lambda s: s.evolution_class)
+        monster_class = globals()[monster["name"]]
+        monster_class.species = monster_class.species._replace(evolution=species_ids[evolution])
+    _evolution_graph = EvolutionGraph(_monsters)
 
 get_all_monsters()
 
@@ -0,0 +1,239 @@
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+from battle import Battle
+from ruleset import Ruleset
+from team import MonsterTeam
+from tournament import play_match
+
+from data_structures.array_sorted_list import merge_sort_items
+from data_structures.bset import BSet
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+
+class Standing(NamedTuple):
+    """ A player team's line in the league leaderboard. """
+    player: int
+    wins: int
+    draws: int
+    losses: int
+    lives: int
+
+
+def play_pairings(players: ArrayR[MonsterTeam], enemies: ArrayR[MonsterTeam], ruleset: Ruleset, verbosity: int, pairings: ArrayR[tuple[int, int]]) -> ArrayR[int]:
+    """
+    Play every (player, enemy) pairing in order, returning the Battle.Result value of each.
+    Teams are regenerated after every battle, so the same teams can be reused for the next pairing.
+    """
+    results = ArrayR(len(pairings))
+    for i in range(len(pairings)):
+        player, enemy = pairings[i]
+        results[i] = play_match(players[player], enemies[enemy], ruleset, verbosity).value
+    return results
+
+
+# Teams a worker process was started with, so that tasks only need to carry indices.
+_worker_teams = None
+
+
+def _init_worker(players: ArrayR[MonsterTeam], enemies: ArrayR[MonsterTeam], ruleset: Ruleset, verbosity: int) -> None:
+    global _worker_teams
+    _worker_teams = (players, enemies, ruleset, verbosity)
+
+
+def _play_in_worker(pairings: ArrayR[tuple[int, int]]) -> ArrayR[int]:
+    players, enemies, ruleset, verbosity = _worker_teams
+    return play_pairings(players, enemies, ruleset, verbosity, pairings)
+
+
+class League:
+    """
+    Swiss-style league of many player teams against one shared sequence of enemy teams.
+
+    Enemy teams are ranked once by lives, their strength in the tower. Every round, the player
+    teams still in the league are ranked by (wins, lives) and each is paired with the enemy of
+    the same relative rank, so the best players face the strongest enemies. As in a Swiss
+    system a player never meets the same enemy twice: if that enemy was already played, the
+    nearest unplayed one is used instead.
+
+    As in the tower, a win scores a point, and a loss or draw costs the player a life. Players
+    start with the lives of their team and leave the league once they have none left.
+    The teams themselves are never modified: lives and scores are kept by the league.
+
+    Usage:
+        league = League(players, enemies)
+        leaderboard = league.run(rounds=5, max_workers=4)
+    """
+
+    def __init__(self, players: ArrayR[MonsterTeam], enemies: ArrayR[MonsterTeam], ruleset: Optional[Ruleset] = None, verbosity: int = 0) -> None:
+        """
+        :raises ValueError: if there are no enemy teams.
+        :complexity: O(E log E + P) where E is the number of enemies and P the number of players.
+        """
+        if len(enemies) == 0:
+            raise ValueError("A league needs at least one enemy team.")
+        self.players = players
+        self.enemies = enemies
+        self.ruleset = ruleset or Ruleset.default()
+        self.verbosity = verbosity
+
+        items = ArrayR(len(enemies))
+        for i in range(len(enemies)):
+            items[i] = ListItem(i, (enemies[i].lives, i))
+        items = merge_sort_items(items)
+        # Enemy indices from weakest to strongest.
+        self.enemy_ranking: ArrayR[int] = ArrayR(len(enemies))
+        for i in range(len(enemies)):
+            self.enemy_ranking[i] = items[i].value
+
+        n = len(players)
+        self.wins, self.draws, self.losses, self.lives = ArrayR(n), ArrayR(n), ArrayR(n), ArrayR(n)
+        # Enemies each player has battled, as 1-based indices.
+        self.played: ArrayR[BSet] = ArrayR(n)
+        for i in range(n):
+            self.wins[i], self.draws[i], self.losses[i] = 0, 0, 0
+            self.lives[i] = players[i].lives
+            self.played[i] = BSet()
+        self.rounds_played = 0
+
+    def active_players(self) -> ArrayR[int]:
+        """
+        Returns the players still in the league, from the weakest to the best standing.
+        :complexity: O(P log P) where P is the number of players.
+        """
+        count = 0
+        for i in range(len(self.players)):
+            if self._active(i):
+                count += 1
+        items = ArrayR(count)
+        count = 0
+        for i in range(len(self.players)):
+            if self._active(i):
+                items[count] = ListItem(i, (self.wins[i], self.lives[i], -i))
+                count += 1
+        items = merge_sort_items(items)
+        res = ArrayR(count)
+        for i in range(count):
+            res[i] = items[i].value
+        return res
+
+    def _active(self, player: int) -> bool:
+        battles = self.wins[player] + self.draws[player] + self.losses[player]
+        return self.lives[player] > 0 and battles < len(self.enemies)
+
+    def pair_round(self) -> ArrayR[tuple[int, int]]:
+        """
+        Returns the (player, enemy) pairings of the next round.
+        :complexity: O(P log P) to rank the players, plus the search for unplayed enemies,
+        which is O(1) per player until they have played most of the enemies.
+        """
+        active = self.active_players()
+        n_enemies = len(self.enemies)
+        pairings = ArrayR(len(active))
+        for k in range(len(active)):
+            player = active[k]
+            target = k * n_enemies // len(active)
+            rank = self._nearest_unplayed(player, target)
+            pairings[k] = (player, self.enemy_ranking[rank])
+        return pairings
+
+    def _nearest_unplayed(self, player: int, target: int) -> int:
+        """ The enemy rank closest to target that player hasn't battled yet, preferring stronger ones. """
+        played = self.played[player]
+        for distance in range(len(self.enemies)):
+            for rank in (target + distance, target - distance):
+                if 0 <= rank < len(self.enemies) and self.enemy_ranking[rank] + 1 not in played:
+                    return rank
+        raise ValueError(f"Player {player} has battled every enemy.")
+
+    def play_round(self, executor: Optional[Executor] = None, chunks: int = 1) -> ArrayR[tuple[int, int]]:
+        """
+        Pair and play one round, returning its pairings.
+
+        Without an executor the battles are played in this process. Otherwise the pairings are
+        split into `chunks` tasks, and the executor's workers must have been started with
+        _init_worker (as run does), so they already hold the teams.
+        :complexity: O(P log P) plus the cost of the battles.
+        """
+        pairings = self.pair_round()
+        if executor is None:
+            results = play_pairings(self.players, self.enemies, self.ruleset, self.verbosity, pairings)
+        else:
+            results = self._play_chunked(executor, pairings, chunks)
+
+        for i in range(len(pairings)):
+            player, enemy = pairings[i]
+            self.played[player].add(enemy + 1)
+            result = results[i]
+            if result == Battle.Result.TEAM1.value:
+                self.wins[player] += 1
+            elif result == Battle.Result.TEAM2.value:
+                self.losses[player] += 1
+                self.lives[player] -= 1
+            else:
+                self.draws[player] += 1
+                self.lives[player] -= 1
+        self.rounds_played += 1
+        return pairings
+
+    def _play_chunked(self, executor: Executor, pairings: ArrayR[tuple[int, int]], chunks: int) -> ArrayR[int]:
+        n = len(pairings)
+        chunks = max(1, min(chunks, n))
+        futures = ArrayR(chunks)
+        for c in range(chunks):
+            lo, hi = c * n // chunks, (c + 1) * n // chunks
+            chunk = ArrayR(hi - lo)
+            for i in range(lo, hi):
+                chunk[i - lo] = pairings[i]
+            futures[c] = executor.submit(_play_in_worker, chunk)
+        results = ArrayR(n)
+        for c in range(chunks):
+            lo = c * n // chunks
+            chunk_results = futures[c].result()
+            for i in range(len(chunk_results)):
+                results[lo + i] = chunk_results[i]
+        return results
+
+    def run(self, rounds: int, max_workers: Optional[int] = None) -> ArrayR[Standing]:
+        """
+        Play up to `rounds` rounds, stopping early once no player is left, and return the leaderboard.
+
+        With max_workers above 1 the battles are played by a ProcessPoolExecutor. Each worker
+        receives the player and enemy teams once when it starts, and every round only sends
+        it the indices of its pairings.
+        :complexity: O(rounds * P log P) plus the cost of the battles.
+        """
+        executor = None
+        if max_workers is not None and max_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.players, self.enemies, self.ruleset, self.verbosity),
+            )
+        try:
+            for _ in range(rounds):
+                if len(self.active_players()) == 0:
+                    break
+                self.play_round(executor, chunks=4 * (max_workers or 1))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self.leaderboard()
+
+    def leaderboard(self) -> ArrayR[Standing]:
+        """
+        Returns every player's standing, best first: most wins, then most lives left, then lowest index.
+        :complexity: O(P log P)
+        """
+        n = len(self.players)
+        items = ArrayR(n)
+        for i in range(n):
+            items[i] = ListItem(i, (-self.wins[i], -self.lives[i], i))
+        items = merge_sort_items(items)
+        res = ArrayR(n)
+        for i in range(n):
+            player = items[i].value
+            res[i] = Standing(player, self.wins[player], self.draws[player], self.losses[player], self.lives[player])
+        return res
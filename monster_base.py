@@ -2,10 +2,24 @@ from __future__ import annotations
 import abc
 
 from stats import Stats
-from elements import EffectivenessCalculator, Element
-from math import ceil
+from ruleset import Ruleset
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from helpers import Species
 
 class MonsterBase(abc.ABC):
+    """
+    A single monster instance.
+
+    Instances only hold the fields that change during a battle. Everything that is
+    the same for a whole species lives on the immutable `species` record that the
+    factory in `helpers` attaches to each monster class.
+    """
+
+    __slots__ = ("level", "simple_mode", "hp", "hp_difference", "original_level")
+
+    species: Species = None
 
     def __init__(self, simple_mode=True, level:int=1) -> None:
         """
@@ -71,36 +85,24 @@ class MonsterBase(abc.ABC):
 
     def alive(self) -> bool:
         """Whether the current monster instance is alive ( HP > 0 )"""
-        if self.hp > 0:
-            return True
+        return self.hp > 0
 
-        return False
-        
-
-    def attack(self, other: MonsterBase):
-        """Attack another monster instance"""
-        # Step 1: Compute attack stat vs. defense stat
-        # Step 2: Apply type effectiveness
-        # Step 3: Ceil to int
-        # Step 4: Lose HP
-        attack_stat = self.get_attack()
-        defense_stat = other.get_defense()
-        
-        if defense_stat < attack_stat / 2:
-            damage = attack_stat - defense_stat
-        elif defense_stat < attack_stat:
-            damage = attack_stat * 5/8 - defense_stat / 4
-        else:
-            damage = attack_stat / 4
-        
-        type1 = Element.from_string(self.get_element())
-        type2 = Element.from_string(other.get_element())
-        
-        effectiveness = EffectivenessCalculator.get_effectiveness(type1, type2)
-        effective_damage = ceil(damage * effectiveness)
-        hp_lost = other.hp - effective_damage
+    def attack(self, other: MonsterBase, ruleset: Optional[Ruleset] = None):
+        """
+        Attack another monster instance.
 
-        other.set_hp(hp_lost)
+        :ruleset: The rules to compute the damage with. Defaults to Ruleset.default().
+        """
+        # Step 1: Compute the damage under the ruleset
+        # Step 2: Lose HP
+        ruleset = ruleset or Ruleset.default()
+        damage = ruleset.damage_by_id(
+            self.get_attack(),
+            other.get_defense(),
+            self.species.element_id,
+            other.species.element_id,
+        )
+        other.set_hp(other.hp - damage)
 
     def ready_to_evolve(self) -> bool:
         """Whether this monster is ready to evolve. See assignment spec for specific logic."""
@@ -117,6 +119,20 @@ class MonsterBase(abc.ABC):
             
             return evolution
 
+    def evolve_in_place(self) -> MonsterBase:
+        """
+        Evolve this monster instance without allocating a new one.
+
+        The instance is switched over to the evolution's class, keeping the same
+        hp difference, and then returned.
+        Only works on monsters whose class comes straight from the factory.
+        """
+        if self.ready_to_evolve():
+            self.__class__ = self.get_evolution()
+            self.original_level = self.level
+            self.set_hp(self.get_max_hp() - self.hp_difference)
+        return self
+
     def __repr__(self):
         return f"LV.{self.get_level()} {self.get_name()}, {self.get_hp()}/{self.get_max_hp()} HP"
 
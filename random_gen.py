@@ -1,15 +1,216 @@
 """
 Random number generator class. Uses LCG method with some reasonable initialisation.
 """
+from __future__ import annotations
 __author__ = "Jackson Goerner"
 
 import time
+from array import array
+from math import isqrt
 
-class RandomGen():
+from data_structures.referential_array import ArrayR
+
+class RandomStream:
+    """
+    A single LCG stream of (seeded) random numbers.
+
+    Streams don't share state, so each worker or thread can own one, and `jump` and `split`
+    make it possible for several of them to reproduce the numbers of one serial stream.
+    All methods are O(1) best/worst case time complexity unless stated otherwise.
+
+    Usage:
+    ```
+    stream = RandomStream(123)
+    stream.randint(1, 10)        # Random number from 1 to 10
+    stream.jump(1000)            # Skip the next 1000 numbers
+    workers = stream.split(4)    # 4 substreams that never overlap this one or each other
+    ```
+    """
+
+    MOD = pow(2, 48)
+    A = 25214903917
+    C = 11
+    # Batches of at least LANES_MIN numbers are drawn by up to LANES lanes, see `randoms`.
+    LANES_MIN = 256
+    LANES = 1024
+
+    def __init__(self, seed=None) -> None:
+        self.set_seed(seed)
+
+    def set_seed(self, seed=None) -> None:
+        """Seed all future calls to `random`."""
+        self.seed = time.time_ns() if seed is None else seed
+
+    def random(self) -> int:
+        """Returns a random integer from 0 to 2^32-1"""
+        self.seed = (self.A * self.seed + self.C) % self.MOD
+        return self.seed >> 16
+
+    def random_float(self) -> float:
+        """Returns a random floating point integer in the range 0 to 1."""
+        return self.random() / (1 << 32)
+
+    def randint(self, lo, hi) -> int:
+        """Returns a random integer from `lo` to `hi` inclusive on both ends."""
+        return (self.random() % (hi - lo + 1)) + lo
+
+    def random_chance(self, ratio) -> bool:
+        """Returns random()/2^32 < ratio"""
+        return self.random_float() < ratio
+
+    def random_choice(self, collection):
+        """Returns a random choice from a collection that supports __getitem__ and __len__"""
+        return collection[self.randint(0, len(collection)-1)]
+
+    def random_shuffle(self, collection) -> None:
+        """
+        Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__
+        :complexity: O(len(collection))
+        """
+        positions = [(self.random(), i) for i in range(len(collection))]
+        positions.sort() # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
+        tmp = [collection[p[1]] for p in positions]
+        for x in range(len(collection)):
+            collection[x] = tmp[x]
+
+    def randoms(self, k: int) -> array:
+        """
+        Returns the next k numbers of `random` as an array of unsigned 64 bit integers.
+
+        Gives exactly the numbers (and leaves the stream in exactly the state) of k calls to
+        `random`. Small batches run the LCG in one loop over local variables. Larger ones use
+        block jump-ahead: L lanes start at the next L states, and step_map(L) advances each lane by
+        L numbers. The lanes are packed into one integer, 128 bits apart, so a single multiply, add
+        and mask advances all of them, and each row of L numbers is read off through its bytes.
+        :raises ValueError: if k is negative.
+        :complexity: O(k)
+        """
+        if k < 0:
+            raise ValueError(f"k should be non-negative, got {k}.")
+        if k < self.LANES_MIN:
+            return self._randoms_serial(k)
+        lanes = min(self.LANES, isqrt(k))
+        seed = self.seed
+        states = self._randoms_serial(lanes, raw=True)
+        self.seed = seed
+
+        # A lane's state times the stride multiplier stays under 2^97, so lanes never carry into each other.
+        ones = int.from_bytes((b"\x01" + bytes(15)) * lanes, "little")
+        stride_a, stride_c = self.step_map(lanes)
+        stride_c *= ones
+        state_mask = (self.MOD - 1) * ones
+        output_mask = ((1 << 32) - 1) * ones
+        packed = int.from_bytes(b"".join(x.to_bytes(16, "little") for x in states), "little")
+
+        res = array("Q")
+        row = array("Q")
+        for _ in range(-(-k // lanes)):
+            row.frombytes(((packed >> 16) & output_mask).to_bytes(16 * lanes, "little"))
+            res.extend(row[::2])
+            del row[:]
+            packed = (packed * stride_a + stride_c) & state_mask
+        del res[k:]
+        self.jump(k)
+        return res
+
+    def _randoms_serial(self, k: int, raw: bool = False) -> array:
+        """ The next k numbers of `random` (or the k states behind them, if raw), one LCG step at a time. """
+        a, c, mask = self.A, self.C, self.MOD - 1
+        shift = 0 if raw else 16
+        seed = self.seed
+        res = array("Q", bytes(8 * k))
+        for i in range(k):
+            seed = (a * seed + c) & mask
+            res[i] = seed >> shift
+        self.seed = seed
+        return res
+
+    def randints(self, lo: int, hi: int, k: int) -> array:
+        """
+        Returns the next k numbers of `randint(lo, hi)` as an array of signed 64 bit integers.
+        :raises ValueError: if k is negative.
+        :complexity: O(k)
+        """
+        span = hi - lo + 1
+        return array("q", [x % span + lo for x in self.randoms(k)])
+
+    def random_floats(self, k: int) -> array:
+        """
+        Returns the next k numbers of `random_float` as an array of doubles.
+        :raises ValueError: if k is negative.
+        :complexity: O(k)
+        """
+        scale = 1 << 32
+        return array("d", [x / scale for x in self.randoms(k)])
+
+    @classmethod
+    def step_map(cls, k: int) -> tuple[int, int]:
+        """
+        Returns (a, c) such that k steps of the LCG take any state x to (a * x + c) % MOD.
+
+        Each step is the affine map x -> A * x + C, and composing two affine maps gives another,
+        so the k-th power is found by repeated squaring. The generator has full period MOD, so
+        negative k steps backwards.
+        :complexity: O(log k)
+        """
+        k %= cls.MOD
+        a, c = 1, 0
+        step_a, step_c = cls.A, cls.C
+        while k > 0:
+            if k & 1:
+                a, c = (step_a * a) % cls.MOD, (step_a * c + step_c) % cls.MOD
+            step_a, step_c = (step_a * step_a) % cls.MOD, (step_a * step_c + step_c) % cls.MOD
+            k >>= 1
+        return a, c
+
+    def jump(self, k: int) -> None:
+        """
+        Advance the stream by k numbers, exactly as k calls to `random` would.
+        :complexity: O(log k)
+        """
+        a, c = self.step_map(k)
+        self.seed = (a * self.seed + c) % self.MOD
+
+    def split(self, n: int) -> ArrayR[RandomStream]:
+        """
+        Returns n new streams, evenly spaced along this one's period.
+
+        This stream keeps the first MOD // (n + 1) numbers from its current state, and the i-th
+        substream starts (i + 1) * (MOD // (n + 1)) numbers ahead, so none of them overlap as
+        long as each draws fewer numbers than that.
+        :raises ValueError: if n is not positive.
+        :complexity: O(n + log n)
+        """
+        if n <= 0:
+            raise ValueError("n should be positive.")
+        a, c = self.step_map(self.MOD // (n + 1))
+        res = ArrayR(n)
+        seed = self.seed
+        for i in range(n):
+            seed = (a * seed + c) % self.MOD
+            res[i] = RandomStream(seed)
+        return res
+
+
+class _RandomGenMeta(type):
+    """ Lets `RandomGen.seed` read and set the state of the default stream. """
+
+    @property
+    def seed(cls) -> int:
+        return cls.stream.seed
+
+    @seed.setter
+    def seed(cls, seed: int) -> None:
+        cls.stream.seed = seed
+
+
+class RandomGen(metaclass=_RandomGenMeta):
     """
     Class used to generate (seeded) random numbers for interesting outcomes and repeatable tests.
 
     Uses LCG method. All methods are O(1) best/worst case time complexity unless stated otherwise.
+    The class methods all draw from one default RandomStream shared by the whole process;
+    create a RandomStream (or `split` this one) for numbers independent of it.
 
     Usage:
     ```
@@ -20,43 +221,41 @@ class RandomGen():
     ```
     """
 
-    MOD = pow(2, 48)
-    A = 25214903917
-    C = 11
+    MOD = RandomStream.MOD
+    A = RandomStream.A
+    C = RandomStream.C
 
-    seed = time.time_ns()
+    stream = RandomStream()
 
     @classmethod
     def set_seed(cls, seed=None):
         """Seed all future calls to `random`."""
-        seed = time.time_ns() if seed is None else seed
-        cls.seed = seed
+        cls.stream.set_seed(seed)
 
     @classmethod
     def random(cls):
         """Returns a random integer from 0 to 2^32-1"""
-        cls.seed = (cls.A * cls.seed + cls.C) % cls.MOD
-        return cls.seed >> 16
+        return cls.stream.random()
 
     @classmethod
     def random_float(cls):
         """Returns a random floating point integer in the range 0 to 1."""
-        return cls.random() / (1 << 32)
+        return cls.stream.random_float()
 
     @classmethod
     def randint(cls, lo, hi):
         """Returns a random integer from `lo` to `hi` inclusive on both ends."""
-        return (cls.random() % (hi - lo + 1)) + lo
+        return cls.stream.randint(lo, hi)
 
     @classmethod
     def random_chance(cls, ratio):
         """Returns random()/2^32 < ratio"""
-        return cls.random_float() < ratio
+        return cls.stream.random_chance(ratio)
 
     @classmethod
     def random_choice(cls, collection) -> None:
         """Returns a random choice from a collection that supports __getitem__ and __len__"""
-        return collection[cls.randint(0, len(collection)-1)]
+        return cls.stream.random_choice(collection)
 
     @classmethod
     def random_shuffle(cls, collection) -> None:
@@ -64,8 +263,44 @@ class RandomGen():
         Randomly shuffles a collection that supports __getitem__, __setitem__ and __len__
         :complexity: O(len(collection))
         """
-        positions = [(RandomGen.random(), i) for i in range(len(collection))]
-        positions.sort() # I can use inbuilt list sorting here - YOU CANNOT ANYWHERE ELSE! >:D
-        tmp = [collection[p[1]] for p in positions]
-        for x in range(len(collection)):
-            collection[x] = tmp[x]
+        cls.stream.random_shuffle(collection)
+
+    @classmethod
+    def randoms(cls, k: int) -> array:
+        """
+        Returns the next k numbers of `random`, see RandomStream.randoms.
+        :complexity: O(k)
+        """
+        return cls.stream.randoms(k)
+
+    @classmethod
+    def randints(cls, lo: int, hi: int, k: int) -> array:
+        """
+        Returns the next k numbers of `randint(lo, hi)`, see RandomStream.randints.
+        :complexity: O(k)
+        """
+        return cls.stream.randints(lo, hi, k)
+
+    @classmethod
+    def random_floats(cls, k: int) -> array:
+        """
+        Returns the next k numbers of `random_float`, see RandomStream.random_floats.
+        :complexity: O(k)
+        """
+        return cls.stream.random_floats(k)
+
+    @classmethod
+    def jump(cls, k: int) -> None:
+        """
+        Advance the default stream by k numbers.
+        :complexity: O(log k)
+        """
+        cls.stream.jump(k)
+
+    @classmethod
+    def split(cls, n: int) -> ArrayR[RandomStream]:
+        """
+        Returns n streams that don't overlap the default stream or each other, see RandomStream.split.
+        :complexity: O(n + log n)
+        """
+        return cls.stream.split(n)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+from typing import Optional
+
+from elements import EffectivenessCalculator, Element
+from math import ceil
+
+
+class Ruleset:
+    """
+    Bundles the rules a battle is resolved with: the element effectiveness chart.
+
+    Rulesets share no state, so any number of them can be used side by side in the same process.
+
+    Usage:
+        ruleset = Ruleset.from_csv("candidate_chart.csv")
+        Battle(ruleset=ruleset).battle(team1, team2)
+    """
+
+    _default: Optional[Ruleset] = None
+
+    def __init__(self, effectiveness: EffectivenessCalculator) -> None:
+        """
+        :effectiveness: The element effectiveness chart of this ruleset.
+        """
+        self.effectiveness = effectiveness
+        # The chart's matrix, row (attacker.value - 1) and column (defender.value - 1), indexed directly by damage.
+        self.matrix = effectiveness.matrix.array
+        self.n_elements = effectiveness.n_elements
+
+    @classmethod
+    def from_csv(cls, csv_file: str) -> Ruleset:
+        return Ruleset(EffectivenessCalculator.from_csv(csv_file))
+
+    @classmethod
+    def default(cls) -> Ruleset:
+        """The ruleset made of the singleton effectiveness chart."""
+        if cls._default is None:
+            cls._default = Ruleset(EffectivenessCalculator.instance)
+        return cls._default
+
+    def damage(self, attack_stat: float, defense_stat: float, attacker: Element, defender: Element) -> int:
+        """
+        Returns the damage an attack deals under this ruleset.
+        :complexity: O(1), the multiplier is read straight from the chart's matrix.
+        """
+        return self.damage_by_id(attack_stat, defense_stat, attacker._value_, defender._value_)
+
+    def damage_by_id(self, attack_stat: float, defense_stat: float, attacker_id: int, defender_id: int) -> int:
+        """
+        Same as damage, with the elements given by their Element value (as in Species.element_id).
+        :complexity: O(1)
+        """
+        multiplier = self.matrix[(attacker_id - 1) * self.n_elements + defender_id - 1]
+        # Step 1: Compute attack stat vs. defense stat
+        # Step 2: Apply type effectiveness
+        # Step 3: Ceil to int
+        if defense_stat < attack_stat / 2:
+            damage = attack_stat - defense_stat
+        elif defense_stat < attack_stat:
+            damage = attack_stat * 5/8 - defense_stat / 4
+        else:
+            damage = attack_stat / 4
+        return ceil(damage * multiplier)
@@ -0,0 +1,205 @@
+"""
+Search for RandomGen seeds that produce a given scenario.
+
+A scenario is a list of constraints on the draws made right after RandomGen.set_seed, each of
+the form randint(lo, hi) == value, i.e. (x_j >> 16) % span == residue where x_j is the LCG state
+after j draws. Every x_j is an affine function of the state y after one chosen pivot draw, so:
+
+* The power of 2 part of each span only looks at a few bits of x_j just above bit 16, and the
+  low b bits of x_j only depend on the low b bits of y. Those bits of y are fixed one at a time,
+  keeping only the prefixes that satisfy every constraint so far.
+* The odd part of the pivot's span is inverted: once the low bits of y are fixed, its higher
+  bits that satisfy the pivot form an arithmetic progression, which is stepped through directly.
+* Whatever is left is scanned, checking the other constraints with early rejection, in chunks
+  that can be spread over several processes.
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, NamedTuple, Optional
+
+from random_gen import RandomStream
+from tower import BattleTower
+from team import MonsterTeam
+from helpers import get_all_monsters
+
+from data_structures.referential_array import ArrayR
+
+STATE_BITS = 48
+OUTPUT_SHIFT = 16
+MASK = RandomStream.MOD - 1
+
+
+class DrawConstraint(NamedTuple):
+    """ The draw-th number after seeding (1-based) satisfies random() % span == residue. """
+    draw: int
+    span: int
+    residue: int
+
+
+def _scan_chunk(constraints: tuple, low: int, low_bits: int, h_start: int, h_step: int, t_start: int, t_end: int, limit: int) -> list[int]:
+    """
+    Scan pivot states y = low + 2^low_bits * (h_start + t * h_step) for t in [t_start, t_end),
+    returning up to `limit` of them that satisfy every (alpha, beta, span, residue) constraint.
+    Module level so it can be sent to worker processes.
+    """
+    found = []
+    delta = (h_step << low_bits) & MASK
+    y = (low + ((h_start + t_start * h_step) << low_bits)) & MASK
+    for _ in range(t_start, t_end):
+        for alpha, beta, span, residue in constraints:
+            if (((alpha * y + beta) & MASK) >> OUTPUT_SHIFT) % span != residue:
+                break
+        else:
+            found.append(y)
+            if len(found) >= limit:
+                break
+        y = (y + delta) & MASK
+    return found
+
+
+class SeedSearch:
+    """
+    Builds a scenario out of the draws made after RandomGen.set_seed, then finds seeds for it.
+
+    Usage:
+        search = SeedSearch()
+        search.team([Flamikin, Aquariuma])  # generate_team's lineup, in spawn order...
+        search.lives(4)                     # ... and its lives
+        seed = search.find()[0]
+        RandomGen.set_seed(seed)
+    """
+
+    def __init__(self) -> None:
+        self.constraints: list[DrawConstraint] = []
+        self.draws = 0
+
+    def randint(self, lo: int, hi: int, value: int) -> SeedSearch:
+        """
+        The next draw is RandomGen.randint(lo, hi) and should return value.
+        :raises ValueError: if value is out of range, or the range is wider than random's outputs.
+        """
+        span = hi - lo + 1
+        if not 1 <= span <= 1 << 32:
+            raise ValueError(f"randint({lo}, {hi}) can't be searched.")
+        if not lo <= value <= hi:
+            raise ValueError(f"randint({lo}, {hi}) never returns {value}.")
+        self.draws += 1
+        if span > 1:
+            self.constraints.append(DrawConstraint(self.draws, span, value - lo))
+        return self
+
+    def skip(self, n: int = 1) -> SeedSearch:
+        """ The next n draws can be anything. """
+        self.draws += n
+        return self
+
+    def team(self, monsters) -> SeedSearch:
+        """
+        The next draws make a MonsterTeam in SelectionMode.RANDOM with exactly these monster types,
+        in the order they are spawned.
+        :raises ValueError: if the team is too big, or one of the monsters can't be spawned.
+        """
+        if not 1 <= len(monsters) <= MonsterTeam.TEAM_LIMIT:
+            raise ValueError(f"Random teams have 1 to {MonsterTeam.TEAM_LIMIT} monsters.")
+        all_monsters = get_all_monsters()
+        spawnable = [all_monsters[x] for x in range(len(all_monsters)) if all_monsters[x].can_be_spawned()]
+        self.randint(1, MonsterTeam.TEAM_LIMIT, len(monsters))
+        for monster in monsters:
+            if monster not in spawnable:
+                raise ValueError(f"{monster.get_name()} can't be spawned.")
+            self.randint(0, len(spawnable) - 1, spawnable.index(monster))
+        return self
+
+    def lives(self, lives: int) -> SeedSearch:
+        """ The next draw is the lives roll of BattleTower.set_my_team or generate_team. """
+        return self.randint(BattleTower.MIN_LIVES, BattleTower.MAX_LIVES, lives)
+
+    def _plan(self) -> tuple[DrawConstraint, tuple, list[int], int, int]:
+        """
+        Pick the pivot and fix the low bits of its state.
+
+        Returns the pivot, the other constraints as (alpha, beta, span, residue) with
+        x_draw = alpha * y + beta, the possible low bits of y, how many bits they are, and
+        the step between values of y's higher bits that satisfy the pivot.
+        """
+        # The pivot with the largest odd part prunes the most by inversion.
+        pivot = max(self.constraints, key=lambda c: self._odd_part(c.span))
+        maps = []
+        for c in self.constraints:
+            alpha, beta = RandomStream.step_map(c.draw - pivot.draw)
+            maps.append((alpha, beta, c.span, c.residue))
+
+        twos = [(alpha, beta, (span & -span).bit_length() - 1, residue) for alpha, beta, span, residue in maps]
+        low_bits = min(STATE_BITS, OUTPUT_SHIFT + max(e for _, _, e, _ in twos))
+        lows = list(range(1 << OUTPUT_SHIFT))
+        for bit in range(OUTPUT_SHIFT, low_bits):
+            checks = [(alpha, beta, (residue >> (bit - OUTPUT_SHIFT)) & 1) for alpha, beta, e, residue in twos if bit - OUTPUT_SHIFT < e]
+            lifted = []
+            for low in lows:
+                for y in (low, low | (1 << bit)):
+                    for alpha, beta, expected in checks:
+                        if ((alpha * y + beta) >> bit) & 1 != expected:
+                            break
+                    else:
+                        lifted.append(y)
+            lows = lifted
+
+        others = tuple(m for m, c in zip(maps, self.constraints) if c is not pivot)
+        return pivot, others, lows, low_bits, self._odd_part(pivot.span)
+
+    @staticmethod
+    def _odd_part(n: int) -> int:
+        return n // (n & -n)
+
+    def find(self, limit: int = 1, max_workers: Optional[int] = None, chunk_size: int = 1 << 16, max_candidates: Optional[int] = None) -> ArrayR[int]:
+        """
+        Returns up to `limit` seeds in [0, 2^48) for which the scenario happens, in scan order.
+
+        With max_workers above 1 the scan is spread over a ProcessPoolExecutor, chunk_size
+        candidate states per task. max_candidates bounds the number of candidates checked,
+        for scenarios that might not have a seed.
+        :complexity: O(2^48 / (2^b * m)) candidates in the worst case, where b is the number of
+        bits fixed by powers of 2 in the spans and m the odd part of the pivot's span.
+        """
+        if not self.constraints:
+            return ArrayR.from_list([0][:limit])
+        pivot, others, lows, low_bits, h_step = self._plan()
+        tasks = self._tasks(others, lows, low_bits, h_step, pivot.residue, chunk_size, max_candidates)
+
+        found = []
+        if max_workers is not None and max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                while len(found) < limit:
+                    batch = [executor.submit(_scan_chunk, *task, limit - len(found)) for task in islice(tasks, 4 * max_workers)]
+                    if not batch:
+                        break
+                    for future in batch:
+                        found.extend(future.result())
+        else:
+            for task in tasks:
+                found.extend(_scan_chunk(*task, limit - len(found)))
+                if len(found) >= limit:
+                    break
+
+        # Step each pivot state back to the seed it came from.
+        alpha, beta = RandomStream.step_map(-pivot.draw)
+        return ArrayR.from_list([(alpha * y + beta) & MASK for y in found[:limit]])
+
+    @staticmethod
+    def _tasks(others: tuple, lows: list[int], low_bits: int, h_step: int, residue: int, chunk_size: int, max_candidates: Optional[int]) -> Iterator[tuple]:
+        """ Generates the scan chunks, for each possible low part of the pivot state in turn. """
+        high_bits = STATE_BITS - low_bits
+        scale = pow(1 << (low_bits - OUTPUT_SHIFT), -1, h_step) if h_step > 1 else 0
+        for low in lows:
+            # Higher bits h with ((low >> 16) + 2^(low_bits - 16) * h) % m == residue % m.
+            h_start = ((residue - (low >> OUTPUT_SHIFT)) * scale) % h_step
+            count = -(-((1 << high_bits) - h_start) // h_step)
+            for t in range(0, count, chunk_size):
+                t_end = min(count, t + chunk_size)
+                if max_candidates is not None:
+                    if max_candidates <= 0:
+                        return
+                    t_end = min(t_end, t + max_candidates)
+                    max_candidates -= t_end - t
+                yield others, low, low_bits, h_start, h_step, t, t_end
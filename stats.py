@@ -1,6 +1,7 @@
 import abc
 
 from data_structures.referential_array import ArrayR
+from data_structures.typed_array import Int32Array, Int64Array
 
 class Stats(abc.ABC):
 
@@ -42,6 +43,11 @@ class SimpleStats(Stats):
         return self.max_hp
 
 class ComplexStats(Stats):
+
+    # Formulas are compiled into an opcode per token, with the number pushed by PUSH tokens alongside.
+    PUSH, LEVEL, SQRT, MIDDLE, ADD, SUB, MUL, DIV, POWER = range(9)
+    OPCODES = {"level": LEVEL, "sqrt": SQRT, "middle": MIDDLE, "+": ADD, "-": SUB, "*": MUL, "/": DIV, "power": POWER}
+
     def __init__(
         self,
         attack_formula: ArrayR[str],
@@ -54,61 +60,106 @@ class ComplexStats(Stats):
         self.defense_formula = defense_formula
         self.speed_formula = speed_formula
         self.max_hp_formula = max_hp_formula
-        
+
+        self.attack_program = self.compile(attack_formula)
+        self.defense_program = self.compile(defense_formula)
+        self.speed_program = self.compile(speed_formula)
+        self.max_hp_program = self.compile(max_hp_formula)
+        # Compiled program of each stat formula, by the formula's id. The formulas are kept alive by self.
+        self.programs = {
+            id(attack_formula): self.attack_program,
+            id(defense_formula): self.defense_program,
+            id(speed_formula): self.speed_program,
+            id(max_hp_formula): self.max_hp_program,
+        }
+
+    @classmethod
+    def compile(cls, exp: ArrayR[str]) -> tuple[Int32Array, Int64Array]:
+        """
+        Returns the opcodes of the postfix formula, and the numbers pushed by its PUSH tokens.
+        :complexity: O(n) where n is the number of tokens.
+        """
+        opcodes, numbers = Int32Array(len(exp)), Int64Array(len(exp))
+        for i in range(len(exp)):
+            val = exp[i]
+            if val in cls.OPCODES:
+                opcodes[i] = cls.OPCODES[val]
+            else:
+                opcodes[i] = cls.PUSH
+                numbers[i] = int(val)
+        return opcodes, numbers
+
     def compute_pos(self, exp: ArrayR[str], level: int):
+        """
+        Evaluates a postfix formula at the given level.
+        The stat formulas of these stats use the programs compiled when they were created. Any other
+        formula is compiled on every call, so to evaluate one repeatedly, compile it once and use evaluate.
+        :complexity: O(n) where n is the number of tokens, plus sorting for "middle".
+        """
+        program = self.programs.get(id(exp))
+        if program is None:
+            program = self.compile(exp)
+        return self.evaluate(program, level)
+
+    def evaluate(self, program: tuple[Int32Array, Int64Array], level: int):
+        """
+        Evaluates a compiled formula at the given level.
+        :complexity: O(n) where n is the number of tokens, plus sorting for "middle".
+        """
+        opcodes, numbers = program
         stack = []
+        n = len(opcodes)
         
-        for i in range(exp.__len__()):
-            val = exp.__getitem__(i)
+        for i in range(n):
+            op = opcodes[i]
             
-            if val not in ["middle", "power", "sqrt", "+", "-", "*", "/", "level"]:
-                stack.append(int(val))
+            if op == self.PUSH:
+                stack.append(numbers[i])
                 
+            elif op == self.LEVEL:
+                stack.append(level)
+                    
+            elif op == self.SQRT:
+                stack.append(stack.pop() ** 0.5)
+                    
+            elif op == self.MIDDLE:
+                if i == n-1:
+                    stack = [sorted(stack)[len(stack)//2]]
+                    
+                else:
+                    data = sorted(stack[1:i])
+                    stack = [stack[0]] + [data[len(data)//2]]
+                    
             else:
-                if val == "level":
-                    stack.append(level)
-                        
-                if val == "sqrt":
-                    stack.append(stack.pop() ** 0.5)
-                        
-                if val == "middle":
-                    if i == exp.__len__()-1:
-                        stack = [sorted(stack)[len(stack)//2]]
-                        
-                    else:
-                        data = sorted(stack[1:i])
-                        stack = [stack[0]] + [data[len(data)//2]]
-                        
-                if val in ["+", "-", "*", "/", "power"]:
-                    left = stack.pop()
-                    right = stack.pop()
+                left = stack.pop()
+                right = stack.pop()
+                
+                if op == self.POWER:
+                    stack.append(right ** left)
+                    
+                elif op == self.ADD:
+                    stack.append(right + left)
+                
+                elif op == self.SUB:
+                    stack.append(right - left)
                     
-                    if val == "power":
-                        stack.append(right ** left)
-                        
-                    if val == "+":
-                        stack.append(right + left)
+                elif op == self.MUL:
+                    stack.append(right * left)
                     
-                    if val == "-":
-                        stack.append(right - left)
-                        
-                    if val == "*":
-                        stack.append(right * left)
-                        
-                    if val == "/":
-                        stack.append(right / left)
+                elif op == self.DIV:
+                    stack.append(right / left)
                     
         return stack.pop()
                 
                 
     def get_attack(self, level: int):
-        return self.compute_pos(self.attack_formula, level)
+        return self.evaluate(self.attack_program, level)
 
     def get_defense(self, level: int):
-        return self.compute_pos(self.defense_formula, level)
+        return self.evaluate(self.defense_program, level)
 
     def get_speed(self, level: int):
-        return self.compute_pos(self.speed_formula, level)
+        return self.evaluate(self.speed_program, level)
 
     def get_max_hp(self, level: int):
-        return self.compute_pos(self.max_hp_formula, level)
\ No newline at end of file
+        return self.evaluate(self.max_hp_program, level)
\ No newline at end of file
@@ -155,8 +155,9 @@ class MonsterTeam:
             if self.monsters[x].can_be_spawned():
                 n_spawnable += 1
 
-        for _ in range(team_size):
-            spawner_index = RandomGen.randint(0, n_spawnable-1)
+        # Same numbers as drawing one randint per monster.
+        spawner_indices = RandomGen.randints(0, n_spawnable-1, team_size)
+        for spawner_index in spawner_indices:
             cur_index = -1
             for x in range(len(self.monsters)):
                 if self.monsters[x].can_be_spawned():
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomStream
+
+from data_structures.array_sorted_list import ArraySortedList
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+class TestArraySortedList(TestCase):
+
+    def keys(self, sorted_list: ArraySortedList) -> list:
+        return [sorted_list[i].key for i in range(len(sorted_list))]
+
+    @number("7.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_add_delete(self):
+        keys = RandomStream(5).randints(0, 50, 200)
+        sorted_list = ArraySortedList(1)
+        for i in range(len(keys)):
+            sorted_list.add(ListItem(i, keys[i]))
+        self.assertListEqual(self.keys(sorted_list), sorted(keys))
+
+        expected = sorted(keys)
+        for index in (0, 150, 10, len(expected) - 4):
+            self.assertEqual(sorted_list.delete_at_index(index).key, expected.pop(index))
+        self.assertListEqual(self.keys(sorted_list), expected)
+        self.assertRaises(IndexError, lambda: sorted_list.delete_at_index(len(sorted_list)))
+
+    @number("7.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_add_many(self):
+        sorted_list = ArraySortedList(2)
+        for key in (3, 5, 5, 9):
+            sorted_list.add(ListItem("old", key))
+        batch = ArrayR.from_list([ListItem("a", 5), ListItem("b", 1), ListItem("c", 12), ListItem("d", 5), ListItem("e", 9)])
+        sorted_list.add_many(batch)
+        items = [(sorted_list[i].value, sorted_list[i].key) for i in range(len(sorted_list))]
+        # New items go after existing ones with the same key, and keep their batch order.
+        self.assertListEqual(items, [
+            ("b", 1), ("old", 3), ("old", 5), ("old", 5), ("a", 5), ("d", 5), ("old", 9), ("e", 9), ("c", 12),
+        ])
+
+        sorted_list.add_many(ArrayR(0))
+        self.assertEqual(len(sorted_list), 9)
+        sorted_list.add(ListItem("f", 4))
+        self.assertEqual(sorted_list.index(sorted_list[2]), 2)
+        self.assertEqual(sorted_list[2].value, "f")
+
+        keys = RandomStream(8).randints(0, 1000, 500)
+        empty = ArraySortedList(1)
+        empty.add_many(ArrayR.from_list([ListItem(i, keys[i]) for i in range(len(keys))]))
+        self.assertListEqual(self.keys(empty), sorted(keys))
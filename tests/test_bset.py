@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from data_structures.bset import BSet
+
+class TestBSet(TestCase):
+
+    @number("7.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bulk_iteration(self):
+        s = BSet.from_iterable([5, 1, 200, 9, 5, 64, 65])
+        self.assertEqual(len(s), 6)
+        self.assertListEqual(s.to_list(), [1, 5, 9, 64, 65, 200])
+        self.assertListEqual(list(s), [1, 5, 9, 64, 65, 200])
+        self.assertTrue(200 in s and 64 in s and 2 not in s)
+        self.assertEqual(str(s), "{1, 5, 9, 64, 65, 200}")
+
+        s.remove(200)
+        self.assertEqual(len(s), 5)
+        self.assertEqual(len(BSet.from_iterable([])), 0)
+        self.assertListEqual(BSet().to_list(), [])
+        self.assertEqual(BSet.from_iterable(x for x in range(1, 1001)).elems, (1 << 1000) - 1)
+        self.assertRaises(TypeError, lambda: BSet.from_iterable([1, 0]))
+        self.assertRaises(TypeError, lambda: BSet.from_iterable([1, "2"]))
+
+    @number("7.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_operators(self):
+        a = BSet.from_iterable([1, 2, 3, 70])
+        b = BSet.from_iterable([3, 4, 70])
+        self.assertListEqual((a | b).to_list(), [1, 2, 3, 4, 70])
+        self.assertListEqual((a & b).to_list(), [3, 70])
+        self.assertListEqual((a - b).to_list(), [1, 2])
+        self.assertListEqual((a ^ b).to_list(), [1, 2, 4])
+        self.assertListEqual(a.symmetric_difference(b).to_list(), [1, 2, 4])
+        # The binary operators leave both sets alone.
+        self.assertListEqual(a.to_list(), [1, 2, 3, 70])
+
+        c = a
+        c |= b
+        self.assertIs(c, a)
+        self.assertListEqual(a.to_list(), [1, 2, 3, 4, 70])
+        a -= BSet.from_iterable([2, 70])
+        self.assertListEqual(a.to_list(), [1, 3, 4])
+        a &= BSet.from_iterable([3, 4, 5])
+        self.assertListEqual(a.to_list(), [3, 4])
+        a ^= BSet.from_iterable([4, 6])
+        self.assertListEqual(a.to_list(), [3, 6])
+        self.assertListEqual(b.to_list(), [3, 4, 70])
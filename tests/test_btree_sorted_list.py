@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomStream
+
+from data_structures.btree_sorted_list import BTreeSortedList
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+class SmallBTreeSortedList(BTreeSortedList):
+    """ Small nodes, so a few hundred items already split and merge them on several levels. """
+    LEAF_CAPACITY = 8
+    BRANCH_CAPACITY = 4
+
+class TestBTreeSortedList(TestCase):
+
+    def keys(self, sorted_list: BTreeSortedList) -> list:
+        return [sorted_list[i].key for i in range(len(sorted_list))]
+
+    @number("7.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_add_delete_index(self):
+        keys = RandomStream(5).randints(0, 50, 400)
+        sorted_list = SmallBTreeSortedList()
+        items = [ListItem(i, keys[i]) for i in range(len(keys))]
+        for item in items:
+            sorted_list.add(item)
+        self.assertListEqual(self.keys(sorted_list), sorted(keys))
+        self.assertListEqual([item.key for item in sorted_list], sorted(keys))
+        # Items with the same key stay in the order they were added.
+        expected = sorted(items, key=lambda item: item.key)
+        for item in items[::37]:
+            self.assertEqual(sorted_list.index(item), expected.index(item))
+
+        for index in (0, 150, 10, len(expected) - 4):
+            self.assertIs(sorted_list.delete_at_index(index), expected.pop(index))
+        while len(expected) > 20:
+            index = len(expected) // 3
+            self.assertIs(sorted_list.delete_at_index(index), expected.pop(index))
+        self.assertListEqual(list(sorted_list), expected)
+        self.assertRaises(IndexError, lambda: sorted_list.delete_at_index(len(sorted_list)))
+        self.assertRaises(ValueError, lambda: sorted_list.index(ListItem("missing", 3)))
+
+        sorted_list[0] = ListItem("first", -1)
+        self.assertEqual(sorted_list[0].value, "first")
+        self.assertRaises(IndexError, lambda: sorted_list.__setitem__(0, ListItem("late", 100)))
+        sorted_list.clear()
+        self.assertTrue(sorted_list.is_empty())
+
+    @number("7.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_rank_range(self):
+        keys = RandomStream(8).randints(0, 1000, 500)
+        sorted_list = SmallBTreeSortedList()
+        sorted_list.add_many(ArrayR.from_list([ListItem(i, keys[i]) for i in range(len(keys))]))
+        self.assertListEqual(self.keys(sorted_list), sorted(keys))
+
+        for low, high in ((0, 1001), (100, 200), (500, 500), (700, 300), (-5, 3)):
+            expected = sorted(key for key in keys if low <= key < high)
+            self.assertEqual(sorted_list.rank(low), sum(1 for key in keys if key < low))
+            self.assertEqual(sorted_list.count_between(low, high), len(expected))
+            self.assertListEqual([item.key for item in sorted_list.items_between(low, high)], expected)
+
+        # Adding to a list that isn't empty keeps existing items first among equal keys.
+        sorted_list.add_many(ArrayR.from_list([ListItem("a", keys[0]), ListItem("b", -1)]))
+        self.assertEqual(sorted_list[0].value, "b")
+        position = sorted_list.rank(keys[0]) + sum(1 for key in keys if key == keys[0])
+        self.assertEqual(sorted_list[position].value, "a")
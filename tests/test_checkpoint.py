@@ -0,0 +1,148 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from battle import Battle
+from checkpoint import CheckpointedTower, CheckpointError
+from team import MonsterTeam
+from tower import BattleTower
+from helpers import Faeboa, Strikeon
+
+from data_structures.referential_array import ArrayR
+
+class TestCheckpoint(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "tower.ckpt")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def make_tower(self, sort: bool = False) -> BattleTower:
+        RandomGen.set_seed(123456789)
+        bt = BattleTower(Battle(verbosity=0))
+        bt.set_my_team(MonsterTeam(
+            team_mode=MonsterTeam.TeamMode.BACK,
+            selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+            provided_monsters=ArrayR.from_list([Faeboa, Strikeon])
+        ))
+        # Enough lives to get through every enemy team.
+        bt.my_team.lives = 12
+        bt.generate_teams(12)
+        if sort:
+            # Reorder the teams and keep a ranking from then on.
+            for _ in range(3):
+                bt.next_battle()
+            bt.sort_by_lives()
+        return bt
+
+    def play(self, run, battles=None) -> list:
+        got = []
+        while run.battles_remaining() and (battles is None or len(got) < battles):
+            result, t1, t2, l1, l2 = run.next_battle()
+            got.append((result, l1, l2, run.tower.out_of_meta().to_list()))
+        return got
+
+    @number("5.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_resume(self):
+        for sort in (False, True):
+            with self.subTest(sort=sort):
+                bt = self.make_tower(sort)
+                expected = []
+                while bt.battles_remaining():
+                    result, t1, t2, l1, l2 = bt.next_battle()
+                    expected.append((result, l1, l2, bt.out_of_meta().to_list()))
+                expected_random = RandomGen.random()
+                self.assertEqual(len(expected), 12)
+
+                run = CheckpointedTower(self.make_tower(sort), self.path, every=2)
+                got = self.play(run, battles=5)
+                # Crash part way through, with a torn line at the end of the log.
+                run.log.write("6,1,")
+                run.log.close()
+                RandomGen.set_seed(0)
+
+                run = CheckpointedTower.resume(self.path, every=2)
+                got.extend(self.play(run))
+                run.close()
+                self.assertListEqual(got, expected)
+                self.assertEqual(RandomGen.random(), expected_random)
+
+    @number("5.19")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_crash_before_new_log(self):
+        bt = self.make_tower()
+        expected = []
+        while bt.battles_remaining():
+            result, t1, t2, l1, l2 = bt.next_battle()
+            expected.append((result, l1, l2, bt.out_of_meta().to_list()))
+
+        run = CheckpointedTower(self.make_tower(), self.path, every=2)
+        got = self.play(run, battles=3)
+        with open(run.log_path, "r") as f:
+            stale = f.read()
+        # Battle 4 writes a checkpoint, then crashes before the log is started again.
+        got.extend(self.play(run, battles=1))
+        result, l1, l2 = got[-1][:3]
+        run.log.close()
+        with open(run.log_path, "w") as f:
+            f.write(stale + f"4,{result.value},{l1},{l2}\n")
+
+        run = CheckpointedTower.resume(self.path, every=2)
+        self.assertEqual(run.tower.battles_played, 4)
+        got.extend(self.play(run))
+        run.close()
+        self.assertListEqual(got, expected)
+
+    @number("5.20")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_reorder_and_journal(self):
+        bt = self.make_tower()
+        expected = []
+        while bt.battles_remaining():
+            if len(expected) == 3:
+                bt.sort_by_lives()
+            result, t1, t2, l1, l2 = bt.next_battle()
+            expected.append((result, l1, l2, bt.out_of_meta().to_list()))
+
+        run = CheckpointedTower(self.make_tower(), self.path, every=2)
+        got = self.play(run, battles=3)
+        run.tower.sort_by_lives()
+        # Battle 4 writes the new order with its checkpoint. Battle 5 reaches the journal, then the run crashes.
+        got.extend(self.play(run, battles=2))
+        run.journal.write(bytes(len(run.pending) // 2 * 3 * 8))
+        run.journal.close()
+        run.log.close()
+
+        run = CheckpointedTower.resume(self.path, every=2)
+        # Battle 5 was dropped from the journal, then replayed from the log and journaled once.
+        self.assertEqual(os.path.getsize(run.journal_path), 5 * 3 * 8)
+        self.assertTrue(os.path.exists(run._order_path(1)))
+        got.extend(self.play(run))
+        run.close()
+        self.assertListEqual(got, expected)
+
+        with open(run.journal_path, "r+b") as f:
+            f.truncate(8)
+        self.assertRaises(CheckpointError, lambda: CheckpointedTower.resume(self.path))
+
+    @number("5.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bad_checkpoints(self):
+        run = CheckpointedTower(self.make_tower(), self.path, every=10)
+        self.play(run, battles=1)
+        run.log.close()
+        with open(run.log_path, "a") as f:
+            f.write("2,3,0,0\n")
+        self.assertRaises(CheckpointError, lambda: CheckpointedTower.resume(self.path))
+        self.assertRaises(ValueError, lambda: CheckpointedTower(self.make_tower(), self.path, every=0))
@@ -5,6 +5,8 @@ from ed_utils.timeout import timeout
 
 from elements import EffectivenessCalculator, Element
 
+from data_structures.referential_array import ArrayR
+
 class TestElementEffectiveness(TestCase):
 
     @number("2.1")
@@ -16,3 +18,28 @@ class TestElementEffectiveness(TestCase):
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.NORMAL, Element.GHOST), 0)
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.DRAGON, Element.DRAGON), 2)
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.WATER, Element.GRASS), 0.5)
+
+    @number("2.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_effectiveness_many(self):
+        attackers = ArrayR.from_list([Element.FIRE.value, Element.FIRE.value, Element.NORMAL.value, Element.DRAGON.value])
+        defenders = ArrayR.from_list([Element.WATER.value, Element.GRASS.value, Element.GHOST.value, Element.DRAGON.value])
+        self.assertListEqual(EffectivenessCalculator.get_effectiveness_many(attackers, defenders).to_list(), [0.5, 2, 0, 2])
+        for attacker in Element:
+            for defender in Element:
+                self.assertIsNotNone(EffectivenessCalculator.get_effectiveness(attacker, defender))
+        self.assertRaises(ValueError, lambda: EffectivenessCalculator.get_effectiveness_many(attackers, ArrayR(1)))
+
+    @number("2.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_element_from_string_and_hash(self):
+        self.assertIs(Element.from_string("Ice"), Element.ICE)
+        self.assertIs(Element.from_string("eLeCtRiC"), Element.ELECTRIC)
+        self.assertRaises(ValueError, lambda: Element.from_string("Electricity"))
+        self.assertRaises(ValueError, lambda: Element.from_string("from_string"))
+        elements = {Element.FIRE: 1, Element.WATER: 2}
+        self.assertEqual(elements[Element.from_string("fire")], 1)
+        self.assertIn(Element.WATER, set(Element))
+        self.assertEqual(len(set(Element)), len(Element))
@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomStream
+
+from data_structures.heap import ArrayHeap
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+class TestArrayHeap(TestCase):
+
+    @number("7.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_heapify_decrease_key(self):
+        keys = RandomStream(3).randints(0, 100, 300)
+        items = [ListItem(i, keys[i]) for i in range(len(keys))]
+        heap = ArrayHeap(len(items))
+        heap.heapify(ArrayR.from_list(items))
+        self.assertEqual(len(heap), len(items))
+        self.assertTrue(heap.is_full())
+        self.assertRaises(Exception, lambda: heap.push(ListItem("extra", 0)))
+        self.assertRaises(ValueError, lambda: heap.heapify([items[0], items[0]]))
+
+        heap.decrease_key(items[123], -1)
+        heap.decrease_key(items[7], -5)
+        self.assertRaises(ValueError, lambda: heap.decrease_key(items[8], 1000))
+        self.assertIs(heap.pop(), items[7])
+        self.assertIs(heap.pop(), items[123])
+        popped = [heap.pop() for _ in range(len(heap))]
+        self.assertListEqual([item.key for item in popped], sorted(item.key for item in popped))
+        self.assertRaises(Exception, heap.pop)
+        self.assertRaises(KeyError, lambda: heap.decrease_key(items[7], -10))
+
+        heap.push(items[0])
+        self.assertIn(items[0], heap)
+        self.assertRaises(ValueError, lambda: heap.push(items[0]))
+
+    @number("7.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_top_k(self):
+        keys = RandomStream(4).randints(0, 1000, 500)
+        items = [ListItem(i, keys[i]) for i in range(len(keys))]
+        expected = sorted(keys, reverse=True)[:10]
+
+        heap = ArrayHeap(0, bound=10)
+        dropped = [heap.push(item) for item in items]
+        self.assertEqual(len(heap), 10)
+        self.assertEqual(sum(item is not None for item in dropped), len(items) - 10)
+        self.assertListEqual([item.key for item in heap.ranked()], expected)
+        # The top of a bounded heap is the smallest key kept.
+        self.assertEqual(heap.peek().key, expected[-1])
+
+        heapified = ArrayHeap(0, bound=10)
+        heapified.heapify(items)
+        self.assertListEqual([item.key for item in heapified.ranked()], expected)
+        self.assertRaises(ValueError, lambda: ArrayHeap(5, bound=0))
@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility, advanced
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from battle import Battle
+from league import League, Standing
+from team import MonsterTeam
+from tower import BattleTower
+
+from data_structures.referential_array import ArrayR
+
+class TestLeague(TestCase):
+
+    def make_league(self) -> League:
+        RandomGen.set_seed(987654321)
+        tower = BattleTower(Battle(verbosity=0))
+        players = ArrayR(8)
+        for i in range(len(players)):
+            players[i] = tower.generate_team()
+        enemies = ArrayR(6)
+        for i in range(len(enemies)):
+            enemies[i] = tower.generate_team()
+        return League(players, enemies)
+
+    @number("5.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_swiss_rounds(self):
+        league = self.make_league()
+        enemy_lives = [league.enemies[i].lives for i in range(len(league.enemies))]
+        player_lives = [league.players[i].lives for i in range(len(league.players))]
+
+        # Enemies ranked weakest first.
+        ranked = [enemy_lives[league.enemy_ranking[i]] for i in range(len(enemy_lives))]
+        self.assertListEqual(ranked, sorted(enemy_lives))
+
+        # First round: no wins yet, so the player with the fewest lives faces the weakest enemy
+        # and the one with the most the strongest.
+        pairings = league.play_round()
+        self.assertEqual(len(pairings), 8)
+        by_lives = sorted(range(8), key=lambda i: (player_lives[i], -i))
+        self.assertListEqual([player for player, _ in pairings.to_list()], by_lives)
+        self.assertEqual(pairings[0][1], league.enemy_ranking[0])
+        self.assertEqual(pairings[7][1], league.enemy_ranking[5])
+
+        faced = {}
+        for _ in range(4):
+            for player, enemy in league.play_round().to_list():
+                faced.setdefault(player, []).append(enemy)
+        for enemies in faced.values():
+            # Never a rematch.
+            self.assertEqual(len(enemies), len(set(enemies)))
+
+        board = league.leaderboard().to_list()
+        self.assertEqual(sorted(s.player for s in board), list(range(8)))
+        for standing in board:
+            self.assertIsInstance(standing, Standing)
+            self.assertEqual(standing.lives, player_lives[standing.player] - standing.draws - standing.losses)
+        keys = [(-s.wins, -s.lives, s.player) for s in board]
+        self.assertListEqual(keys, sorted(keys))
+
+        # The shared teams are left as they were.
+        self.assertListEqual([league.enemies[i].lives for i in range(len(league.enemies))], enemy_lives)
+        self.assertListEqual([league.players[i].lives for i in range(len(league.players))], player_lives)
+
+    @number("5.16")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_workers(self):
+        expected = self.make_league().run(rounds=4).to_list()
+        got = self.make_league().run(rounds=4, max_workers=2).to_list()
+        self.assertListEqual(got, expected)
+        self.assertRaises(ValueError, lambda: League(ArrayR(1), ArrayR(0)))
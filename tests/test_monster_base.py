@@ -6,7 +6,9 @@ from ed_utils.timeout import timeout
 from monster_base import MonsterBase
 # These classes inherit from MonsterBase,
 # but you don't need to implement them explicitly.
-from helpers import Infernox, Ironclad, Metalhorn
+from helpers import Infernox, Ironclad, Metalhorn, Flamikin, Infernoth, Normake, Strikeon, get_evolution_graph, EvolutionGraph
+
+from data_structures.referential_array import ArrayR
 
 class TestMonsters(TestCase):
 
@@ -72,3 +74,61 @@ class TestMonsters(TestCase):
         self.assertEqual(t.get_max_hp(), 14)
         self.assertEqual(t.get_hp(), 12)
 
+
+    @number("1.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_evolve_in_place(self):
+        t:MonsterBase = Metalhorn(simple_mode=True, level=2)
+        self.assertFalse(hasattr(t, "__dict__"))
+        self.assertIs(t.species, Metalhorn.species)
+        t.level_up()
+        t.set_hp(t.get_hp() - 3)
+        evolved = t.evolve_in_place()
+        self.assertIs(evolved, t)
+        self.assertIsInstance(t, Ironclad)
+        self.assertEqual(str(t), "LV.3 Ironclad, 14/17 HP")
+        self.assertEqual(t.ready_to_evolve(), False)
+
+    @number("1.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_evolution_graph(self):
+        graph = get_evolution_graph()
+        flamikin, infernoth, infernox = Flamikin.species.id, Infernoth.species.id, Infernox.species.id
+        self.assertEqual(graph.next_id[flamikin], infernoth)
+        self.assertEqual(graph.next_id[infernox], None)
+        self.assertEqual(graph.root[infernox], flamikin)
+        self.assertEqual(graph.depth[infernox], 2)
+        self.assertEqual(graph.final_form[flamikin], infernox)
+        self.assertListEqual(graph.chain(infernoth).to_list(), [flamikin, infernoth, infernox])
+        self.assertListEqual(graph.chain(Strikeon.species.id).to_list(), [Strikeon.species.id, Normake.species.id])
+
+        # Only the first Metalhorn has levelled up since it was created.
+        ids, hps, original_levels = graph.batch_evolve(
+            ArrayR.from_list([Metalhorn.species.id, Metalhorn.species.id, Infernox.species.id]),
+            ArrayR.from_list([3, 2, 5]),
+            ArrayR.from_list([2, 2, 1]),
+            ArrayR.from_list([3, 3, 0]),
+        )
+        self.assertListEqual(ids.to_list(), [Ironclad.species.id, Metalhorn.species.id, Infernox.species.id])
+        self.assertListEqual(hps.to_list(), [14, 10, 13])
+        self.assertListEqual(original_levels.to_list(), [3, 2, 1])
+
+    @number("1.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_evolution_cycles(self):
+        def catalogue(evolutions):
+            res = []
+            for i, evolution in enumerate(evolutions):
+                species = Flamikin.species._replace(id=i, evolution=evolution)
+                res.append(type(f"Fake{i}", (Flamikin,), {"species": species}))
+            return ArrayR.from_list(res)
+
+        # A chain from a root that runs into a cycle: 0 -> 1 -> 2 -> 1.
+        self.assertRaises(ValueError, lambda: EvolutionGraph(catalogue([1, 2, 1])))
+        # A cycle with no root at all.
+        self.assertRaises(ValueError, lambda: EvolutionGraph(catalogue([1, 0])))
+        graph = EvolutionGraph(catalogue([1, 2, None]))
+        self.assertEqual(graph.final_form[0], 2)
@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from data_structures.queue_adt import CircularQueue, GrowableCircularQueue
+from data_structures.stack_adt import ArrayStack, GrowableArrayStack
+
+class TestQueueStack(TestCase):
+
+    @number("7.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_queue_bulk_and_growth(self):
+        queue = CircularQueue(5)
+        queue.extend([1, 2, 3])
+        self.assertListEqual(queue.serve_many(2).to_list(), [1, 2])
+        # Wraps around the end of the array.
+        queue.extend([4, 5, 6, 7])
+        self.assertTrue(queue.is_full())
+        self.assertRaises(Exception, lambda: queue.extend([8]))
+        self.assertRaises(Exception, lambda: queue.serve_many(6))
+        self.assertEqual(len(queue), 5)
+        self.assertListEqual(queue.serve_many(5).to_list(), [3, 4, 5, 6, 7])
+        self.assertListEqual(queue.serve_many(0).to_list(), [])
+        self.assertRaises(ValueError, lambda: queue.serve_many(-1))
+
+        queue = GrowableCircularQueue(4)
+        queue.extend([0, 1, 2])
+        self.assertEqual(queue.serve(), 0)
+        # Growing from a wrapped-around state keeps the order.
+        for i in range(3, 100):
+            queue.append(i)
+        self.assertFalse(queue.is_full())
+        self.assertGreaterEqual(len(queue.array), 99)
+        self.assertListEqual(queue.serve_many(50).to_list(), list(range(1, 51)))
+        queue.extend(range(100, 300))
+        self.assertListEqual([queue.serve() for _ in range(len(queue))], list(range(51, 300)))
+        self.assertEqual(len(queue.array), 4)
+        self.assertRaises(Exception, queue.serve)
+
+        # Serving most of a large queue at once shrinks it all the way back.
+        queue.extend(range(1000))
+        self.assertListEqual(queue.serve_many(999).to_list(), list(range(999)))
+        self.assertEqual(len(queue), 1)
+        self.assertGreaterEqual(len(queue), len(queue.array) // 4)
+        self.assertLess(len(queue.array), 8)
+        self.assertEqual(queue.serve(), 999)
+
+    @number("7.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_stack_bulk_and_growth(self):
+        stack = ArrayStack(4)
+        stack.extend([1, 2, 3])
+        self.assertEqual(stack.peek(), 3)
+        self.assertRaises(Exception, lambda: stack.extend([4, 5]))
+        self.assertEqual(len(stack), 3)
+        self.assertListEqual(stack.pop_many(2).to_list(), [3, 2])
+        self.assertRaises(Exception, lambda: stack.pop_many(2))
+        self.assertRaises(ValueError, lambda: stack.pop_many(-1))
+        self.assertEqual(stack.pop(), 1)
+
+        stack = GrowableArrayStack(2)
+        for i in range(100):
+            stack.push(i)
+        stack.extend(range(100, 150))
+        self.assertFalse(stack.is_full())
+        self.assertListEqual(stack.pop_many(3).to_list(), [149, 148, 147])
+        self.assertListEqual([stack.pop() for _ in range(len(stack))], list(range(146, -1, -1)))
+        self.assertEqual(len(stack.array), 2)
+        self.assertRaises(Exception, stack.pop)
+
+        stack.extend(range(1000))
+        self.assertListEqual(stack.pop_many(999).to_list(), list(range(999, 0, -1)))
+        self.assertGreaterEqual(len(stack), len(stack.array) // 4)
+        self.assertLess(len(stack.array), 8)
+        self.assertEqual(stack.pop(), 0)
@@ -0,0 +1,104 @@
+import threading
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from random_gen import RandomGen, RandomStream
+
+class TestRandomGen(TestCase):
+
+    @number("6.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_streams(self):
+        # The facade draws the same numbers as a stream with the same seed.
+        RandomGen.set_seed(2024)
+        stream = RandomStream(2024)
+        for _ in range(20):
+            self.assertEqual(RandomGen.randint(1, 100), stream.randint(1, 100))
+        self.assertEqual(RandomGen.seed, stream.seed)
+
+        # Streams don't share state.
+        a, b = RandomStream(7), RandomStream(7)
+        a.random()
+        self.assertNotEqual(a.seed, b.seed)
+        b.random()
+        self.assertEqual(a.random(), b.random())
+
+        items = list(range(10))
+        RandomStream(3).random_shuffle(items)
+        self.assertListEqual(sorted(items), list(range(10)))
+        self.assertIn(RandomStream(3).random_choice(items), items)
+
+    @number("6.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_jump(self):
+        for k in (0, 1, 2, 17, 1000):
+            stepped, jumped = RandomStream(99), RandomStream(99)
+            for _ in range(k):
+                stepped.random()
+            jumped.jump(k)
+            self.assertEqual(jumped.seed, stepped.seed)
+        # Jumping backwards undoes the steps, and a whole period comes back around.
+        stream = RandomStream(99)
+        stream.jump(12345)
+        stream.jump(-12345)
+        self.assertEqual(stream.seed, 99)
+        stream.jump(RandomStream.MOD)
+        self.assertEqual(stream.seed, 99)
+        # Huge jumps are still fast.
+        stream.jump(10**40)
+
+    @number("6.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_split(self):
+        parent = RandomStream(42)
+        subs = parent.split(3)
+        stride = RandomStream.MOD // 4
+        for i in range(3):
+            expected = RandomStream(42)
+            expected.jump((i + 1) * stride)
+            self.assertEqual(subs[i].seed, expected.seed)
+        self.assertEqual(parent.seed, 42)
+        self.assertRaises(ValueError, lambda: parent.split(0))
+
+        # Workers on their own substreams reproduce a serial run over the same substreams.
+        serial = [[subs[i].random() for _ in range(100)] for i in range(3)]
+        subs = RandomStream(42).split(3)
+        results = [None] * 3
+        def work(i):
+            results[i] = [subs[i].random() for _ in range(100)]
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertListEqual(results, serial)
+
+    @number("6.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bulk(self):
+        for seed in (0, 5, 2**60 + 3):
+            one, bulk = RandomStream(seed), RandomStream(seed)
+            self.assertListEqual(list(bulk.randoms(50)), [one.random() for _ in range(50)])
+            self.assertListEqual(list(bulk.randints(-3, 7, 50)), [one.randint(-3, 7) for _ in range(50)])
+            self.assertListEqual(list(bulk.random_floats(50)), [one.random_float() for _ in range(50)])
+            self.assertEqual(bulk.seed, one.seed)
+            # Large enough for the lanes, with a partial last row.
+            self.assertListEqual(list(bulk.randoms(3001)), [one.random() for _ in range(3001)])
+            self.assertListEqual(list(bulk.randints(1, 6, 700)), [one.randint(1, 6) for _ in range(700)])
+            self.assertEqual(bulk.seed, one.seed)
+        self.assertEqual(len(RandomStream(1).randoms(0)), 0)
+        stream = RandomStream(1)
+        for draw in (stream.randoms, stream.random_floats, lambda k: stream.randints(1, 6, k)):
+            self.assertRaises(ValueError, lambda: draw(-1))
+            self.assertRaises(ValueError, lambda: draw(-5000))
+        self.assertEqual(stream.seed, 1)
+
+        RandomGen.set_seed(11)
+        expected = RandomStream(11).randints(1, 6, 10)
+        self.assertEqual(RandomGen.randints(1, 6, 10), expected)
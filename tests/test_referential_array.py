@@ -0,0 +1,55 @@
+import gc
+import pickle
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from data_structures.referential_array import ArrayR
+
+class TestArrayR(TestCase):
+
+    @number("7.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bulk(self):
+        items = [str(i) * 3 for i in range(100)]
+        array = ArrayR.from_list(items)
+        del items
+        gc.collect()
+        self.assertEqual(array[42], "424242")
+        self.assertListEqual(list(array), [str(i) * 3 for i in range(100)])
+        self.assertListEqual(array.to_list(), list(array))
+        self.assertEqual(str(ArrayR.from_list([1, 2, 3])), "[1, 2, 3]")
+        self.assertEqual(str(ArrayR(0)), "[]")
+        self.assertEqual(array.index("999"), 9)
+        self.assertRaises(ValueError, lambda: array.index("nope"))
+
+        copy = array.copy()
+        array[0] = "changed"
+        self.assertEqual(copy[0], "000")
+        self.assertEqual(pickle.loads(pickle.dumps(copy)).to_list(), copy.to_list())
+
+    @number("7.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_slices(self):
+        array = ArrayR.from_list(list(range(10)))
+        part = array[2:5]
+        self.assertIsInstance(part, ArrayR)
+        self.assertListEqual(part.to_list(), [2, 3, 4])
+        self.assertListEqual(array[::3].to_list(), [0, 3, 6, 9])
+
+        array[2:5] = ArrayR.from_list(["a", "b", "c"])
+        array[7:] = ["x", "y", "z"]
+        array[::4] = [None, None, None]
+        self.assertListEqual(array.to_list(), [None, 1, "a", "b", None, 5, 6, "x", None, "z"])
+        with self.assertRaises(ValueError):
+            array[0:2] = [1]
+
+        array.extend(ArrayR.from_list([10, 11]))
+        array.extend([12])
+        self.assertEqual(len(array), 13)
+        self.assertListEqual(array[-3:].to_list(), [10, 11, 12])
+        gc.collect()
+        self.assertEqual(array[2], "a")
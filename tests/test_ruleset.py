@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from elements import EffectivenessCalculator, Element
+from ruleset import Ruleset
+from helpers import Flamikin, Vineon
+
+from data_structures.referential_array import ArrayR
+
+class TestRuleset(TestCase):
+
+    def make_chart(self, value: float) -> EffectivenessCalculator:
+        names = ArrayR.from_list([element.name.title() for element in Element])
+        values = ArrayR(len(names) * len(names))
+        for i in range(len(values)):
+            values[i] = value
+        return EffectivenessCalculator(names, values)
+
+    @number("2.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_default_ruleset(self):
+        ruleset = Ruleset.default()
+        self.assertIs(ruleset, Ruleset.default())
+        self.assertIs(ruleset.effectiveness, EffectivenessCalculator.instance)
+        # Flamikin (3 attack) vs Vineon (3 defense), fire is super effective on grass.
+        vineon = Vineon()
+        Flamikin().attack(vineon)
+        self.assertEqual(vineon.get_hp(), vineon.get_max_hp() - 2)
+
+    @number("2.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_concurrent_rulesets(self):
+        neutral = Ruleset(self.make_chart(1))
+        immune = Ruleset(self.make_chart(0))
+        vineon = Vineon()
+        Flamikin().attack(vineon, neutral)
+        self.assertEqual(vineon.get_hp(), vineon.get_max_hp() - 1)
+        Flamikin().attack(vineon, immune)
+        self.assertEqual(vineon.get_hp(), vineon.get_max_hp() - 1)
+        self.assertEqual(neutral.damage(3, 2, Element.FIRE, Element.GRASS), 2)
+        self.assertEqual(immune.damage(3, 2, Element.FIRE, Element.GRASS), 0)
+        self.assertEqual(Ruleset.default().damage(3, 2, Element.FIRE, Element.GRASS), 3)
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility, advanced
+from ed_utils.timeout import timeout
+from random_gen import RandomGen, RandomStream
+
+from battle import Battle
+from seed_search import SeedSearch
+from team import MonsterTeam
+from tower import BattleTower
+from helpers import Flamikin, Aquariuma, Strikeon
+
+class TestSeedSearch(TestCase):
+
+    @number("6.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_draws(self):
+        # Odd, power of 2 and mixed spans, with unconstrained draws in between.
+        search = SeedSearch().randint(0, 63, 42).skip(2).randint(1, 9, 3).randint(10, 33, 30).randint(0, 0, 0)
+        seeds = search.find(limit=5)
+        self.assertEqual(len(seeds), 5)
+        self.assertEqual(len(set(seeds)), 5)
+        for seed in seeds:
+            stream = RandomStream(seed)
+            self.assertEqual(stream.randint(0, 63), 42)
+            stream.jump(2)
+            self.assertEqual(stream.randint(1, 9), 3)
+            self.assertEqual(stream.randint(10, 33), 30)
+
+        self.assertRaises(ValueError, lambda: SeedSearch().randint(1, 6, 7))
+        self.assertRaises(ValueError, lambda: SeedSearch().randint(0, 1 << 33, 0))
+        # Bounded searches stop early.
+        self.assertEqual(len(SeedSearch().randint(0, 999, 1).randint(0, 999, 2).find(max_candidates=10)), 0)
+
+    @number("6.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout(10)
+    def test_scenarios(self):
+        search = SeedSearch().lives(3).team([Flamikin, Aquariuma, Strikeon]).lives(7)
+        seeds = search.find(limit=2)
+        self.assertEqual(len(seeds), 2)
+        for seed in seeds:
+            RandomGen.set_seed(seed)
+            bt = BattleTower(Battle(verbosity=0))
+            bt.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.PROVIDED, provided_monsters=[Flamikin]))
+            self.assertEqual(bt.my_team.lives, 3)
+            enemy = bt.generate_team()
+            self.assertListEqual([type(monster) for monster in enemy.original], [Flamikin, Aquariuma, Strikeon])
+            self.assertEqual(enemy.lives, 7)
+
+        # Worker processes find the same seeds in the same order.
+        self.assertListEqual(search.find(limit=2, max_workers=2, chunk_size=1 << 12).to_list(), seeds.to_list())
@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility, advanced
+from ed_utils.timeout import timeout
+
+from battle import Battle
+from team import MonsterTeam
+from tournament import Tournament
+from helpers import Flamikin, Aquariuma, Strikeon
+
+from data_structures.referential_array import ArrayR
+
+def make_team(*monsters) -> MonsterTeam:
+    return MonsterTeam(
+        team_mode=MonsterTeam.TeamMode.BACK,
+        selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+        provided_monsters=ArrayR.from_list(list(monsters)),
+    )
+
+class TestTournament(TestCase):
+
+    def make_tournament(self) -> Tournament:
+        # Team C is much stronger than everyone else.
+        teams = ArrayR.from_list([
+            make_team(Flamikin),
+            make_team(Aquariuma),
+            make_team(Aquariuma, Aquariuma, Aquariuma, Aquariuma, Aquariuma, Aquariuma),
+            make_team(Strikeon),
+            make_team(Flamikin, Strikeon),
+        ])
+        bracket = ArrayR.from_list(["A", "B", "+", "C", "D", "+", "+", "E", "+"])
+        return Tournament(bracket, teams)
+
+    @number("5.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_parse(self):
+        tournament = self.make_tournament()
+        self.assertEqual(tournament.n_teams, 5)
+        self.assertEqual(tournament.n_matches, 4)
+        self.assertEqual(tournament.rounds, 3)
+        self.assertListEqual(tournament.names.to_list(), ["A", "B", "C", "D", "E"])
+        self.assertListEqual(tournament.round_matches(1).to_list(), [0, 1])
+        self.assertListEqual(tournament.round_matches(2).to_list(), [2])
+        self.assertListEqual(tournament.round_matches(3).to_list(), [3])
+        self.assertEqual(len(tournament.round_matches(4)), 0)
+        # Match 2 joins the winners of matches 0 and 1, match 3 joins that with E.
+        self.assertListEqual(tournament.left.to_list(), [0, 2, 5, 7])
+        self.assertListEqual(tournament.right.to_list(), [1, 3, 6, 4])
+        teams = ArrayR.from_list([make_team(Flamikin), make_team(Flamikin)])
+        self.assertRaises(ValueError, lambda: Tournament(ArrayR.from_list(["A", "B", "+", "+"]), teams))
+        self.assertRaises(ValueError, lambda: Tournament(ArrayR.from_list(["A", "B"]), teams))
+        self.assertRaises(ValueError, lambda: Tournament(ArrayR.from_list(["A", "B", "C", "+", "+"]), teams))
+
+    @number("5.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_run(self):
+        tournament = self.make_tournament()
+        champion = tournament.run(max_workers=2)
+        self.assertEqual(champion, 2)
+        self.assertEqual(tournament.winners[1], 2)
+        self.assertEqual(tournament.winners[2], 2)
+        self.assertEqual(tournament.winners[3], 2)
+        self.assertEqual(tournament.results[3], Battle.Result.TEAM1)
+        # Teams are ready for the next tournament.
+        self.assertEqual(len(tournament.teams[2]), 6)
+
+    @number("5.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_run_processes(self):
+        threaded = self.make_tournament()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            threaded.run(executor=executor)
+        tournament = self.make_tournament()
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            champion = tournament.run(executor=executor)
+        self.assertEqual(champion, 2)
+        self.assertListEqual(tournament.results.to_list(), threaded.results.to_list())
+        self.assertListEqual(tournament.winners.to_list(), threaded.winners.to_list())
+        # The default executor uses processes too.
+        tournament = self.make_tournament()
+        champion = tournament.run(max_workers=2)
+        self.assertEqual(champion, 2)
+        self.assertListEqual(tournament.results.to_list(), threaded.results.to_list())
+        self.assertListEqual(tournament.winners.to_list(), threaded.winners.to_list())
@@ -1,3 +1,4 @@
+import itertools
 from unittest import TestCase
 
 from ed_utils.decorators import number, visibility, advanced
@@ -255,3 +256,136 @@ class TestTower(TestCase):
         self.assertFalse(tournament_balanced(invalid2))
         self.assertFalse(tournament_balanced(unbalanced))
         self.assertTrue(tournament_balanced(balanced))
+
+    @number("5.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_meta_history(self):
+        RandomGen.set_seed(123456789)
+        bt = BattleTower(Battle(verbosity=0))
+        bt.set_my_team(MonsterTeam(
+            team_mode=MonsterTeam.TeamMode.BACK,
+            selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+            provided_monsters=ArrayR.from_list([Faeboa])
+        ))
+        bt.generate_teams(3)
+        # Same teams as test_out_of_meta, we always have Fairy.
+        # 1: Fighting, Fairy, Electric, Flying, Grass, Dragon
+        # 2: Ice, Electric, Ground, Steel
+        # 3: Fighting
+        for _ in range(3):
+            bt.next_battle()
+        history = bt.history
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.count(Element.FAIRY, 0, 2), 3)
+        self.assertEqual(history.count(Element.ELECTRIC, 0, 2), 2)
+        self.assertEqual(history.count(Element.ELECTRIC, 2, 2), 0)
+        self.assertListEqual(history.present(2, 2).to_list(), [Element.FIGHTING, Element.FAIRY])
+        self.assertListEqual(history.present(1, 2).to_list(), [Element.ELECTRIC, Element.FIGHTING, Element.GROUND, Element.ICE, Element.FAIRY, Element.STEEL])
+        self.assertNotIn(Element.FIRE, history.present(0, 2).to_list())
+        self.assertIn(Element.FIRE, history.absent(0, 2).to_list())
+        self.assertNotIn(Element.GRASS, history.absent(0, 1).to_list())
+        self.assertIn(Element.GRASS, history.absent(1, 2).to_list())
+        self.assertEqual(history.last_appearance(Element.FIGHTING), 2)
+        self.assertEqual(history.last_appearance(Element.ELECTRIC), 1)
+        self.assertEqual(history.last_appearance(Element.GRASS), 0)
+        self.assertEqual(history.last_appearance(Element.FIGHTING, before=2), 0)
+        self.assertEqual(history.last_appearance(Element.FIRE), None)
+        self.assertRaises(IndexError, lambda: history.count(Element.FIRE, 2, 3))
+
+    @number("5.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_sort_by_lives_ranking(self):
+        RandomGen.set_seed(123456789)
+        bt = BattleTower(Battle(verbosity=0))
+        bt.set_my_team(MonsterTeam(
+            team_mode=MonsterTeam.TeamMode.BACK,
+            selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+            provided_monsters=ArrayR.from_list([GoodFlamikin])
+        ))
+        bt.generate_teams(6)
+        # They have lives 7, 5, 3, 10, 7 and 3.
+        teams = bt.enemy_teams.to_list()
+        elements = bt.enemy_elements.to_list()
+        bt.sort_by_lives()
+        # Ties keep their order.
+        self.assertListEqual([team.lives for team in bt.enemy_teams], [3, 3, 5, 7, 7, 10])
+        self.assertListEqual(bt.enemy_teams.to_list(), [teams[2], teams[5], teams[1], teams[0], teams[4], teams[3]])
+        self.assertListEqual(bt.enemy_elements.to_list(), [elements[2], elements[5], elements[1], elements[0], elements[4], elements[3]])
+
+        # The ranking follows lives changes from here on: 2 2 4 7 7 10
+        for _ in range(3):
+            bt.next_battle()
+        self.assertListEqual([bt.ranking[i].key[0] for i in range(len(bt.ranking))], [2, 2, 4, 7, 7, 10])
+        # 2 2 4 6 6 9
+        for _ in range(3):
+            bt.next_battle()
+        self.assertListEqual([bt.ranking[i].key[0] for i in range(len(bt.ranking))], [2, 2, 4, 6, 6, 9])
+        bt.sort_by_lives()
+        self.assertEqual(bt.current_enemy_index, 0)
+        self.assertListEqual([team.lives for team in bt.enemy_teams], [2, 2, 4, 6, 6, 9])
+        self.assertListEqual(bt.enemy_teams.to_list(), [teams[2], teams[5], teams[1], teams[0], teams[4], teams[3]])
+
+    @number("5.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_tournament_stream(self):
+        def bracket(depth):
+            if depth == 0:
+                yield "team"
+                return
+            yield from bracket(depth - 1)
+            yield from bracket(depth - 1)
+            yield "+"
+
+        self.assertTrue(tournament_balanced(bracket(14)))
+        self.assertTrue(tournament_balanced(iter(["a"])))
+        self.assertFalse(tournament_balanced(iter([])))
+        self.assertFalse(tournament_balanced(iter(["a", "+"])))
+        self.assertFalse(tournament_balanced(iter(["a", "b", "+", "c", "+"])))
+        # Three brackets of the same size can never be balanced, so this stops without reading the rest.
+        self.assertFalse(tournament_balanced(itertools.repeat("a")))
+        self.assertFalse(tournament_balanced(itertools.cycle(["a", "b", "+", "c"])))
+
+    @number("5.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_streamed_teams(self):
+        def play(stream: bool):
+            RandomGen.set_seed(123456789)
+            bt = BattleTower(Battle(verbosity=0))
+            bt.set_my_team(MonsterTeam(
+                team_mode=MonsterTeam.TeamMode.BACK,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                provided_monsters=ArrayR.from_list([Faeboa])
+            ))
+            if stream:
+                bt.stream_teams(3, lookahead=1)
+            else:
+                bt.generate_teams(3)
+            got = [bt.out_of_meta().to_list()]
+            while bt.battles_remaining():
+                result, t1, t2, l1, l2 = bt.next_battle()
+                got.append((result, [str(monster) for monster in t2.group], l1, l2, bt.out_of_meta().to_list()))
+            return got
+
+        self.assertListEqual(play(stream=True), play(stream=False))
+
+        RandomGen.set_seed(123456789)
+        bt = BattleTower(Battle(verbosity=0))
+        bt.set_my_team(MonsterTeam(
+            team_mode=MonsterTeam.TeamMode.BACK,
+            selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+            provided_monsters=ArrayR.from_list([GoodFlamikin])
+        ))
+        bt.stream_teams(lookahead=2)
+        for _ in range(50):
+            self.assertTrue(bt.battles_remaining())
+            bt.next_battle()
+        self.assertEqual(bt.enemy_teams.generated, 53)
+        self.assertRaises(IndexError, lambda: bt.enemy_teams[49])
+        self.assertIsNotNone(bt.enemy_teams[52])
+        self.assertRaises(ValueError, bt.sort_by_lives)
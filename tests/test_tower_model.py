@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility, advanced
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from battle import Battle
+from team import MonsterTeam
+from tower import BattleTower
+from tower_model import Matchup, MatchupTable, TowerModel, TowerOutcome
+
+from data_structures.referential_array import ArrayR
+
+class TestTowerModel(TestCase):
+
+    @number("5.17")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_solve(self):
+        coin = Matchup(0.5, 0.0, 0.5)
+        model = TowerModel(2, ArrayR.from_list([1, 1]), ArrayR.from_list([coin, coin]))
+        outcome = model.solve()
+        self.assertIsInstance(outcome, TowerOutcome)
+        for got, expected in zip(outcome, (0.25, 0.25, 0.5, 2.0)):
+            self.assertAlmostEqual(got, expected)
+
+        # Enemies with 2 lives can't be knocked out in a single battle.
+        sure_win = Matchup(1.0, 0.0, 0.0)
+        outcome = TowerModel(3, ArrayR.from_list([2, 1]), ArrayR.from_list([sure_win, sure_win])).solve()
+        self.assertAlmostEqual(outcome.exhausted, 1.0)
+        self.assertAlmostEqual(outcome.expected_battles, 2.0)
+
+        # Draws cost both sides a life.
+        draw = Matchup(0.0, 1.0, 0.0)
+        outcome = TowerModel(1, ArrayR.from_list([1, 1]), ArrayR.from_list([draw, draw])).solve()
+        self.assertAlmostEqual(outcome.eliminated, 1.0)
+        self.assertAlmostEqual(outcome.expected_battles, 1.0)
+
+        # The probabilities always add up to 1.
+        mixed = Matchup(0.3, 0.2, 0.5)
+        lives = ArrayR.from_list([1, 0, 1, 1, 0, 1])
+        matchups = ArrayR.from_list([mixed] * 6)
+        for my_lives in range(1, 6):
+            outcome = TowerModel(my_lives, lives, matchups).solve()
+            self.assertAlmostEqual(outcome.cleared + outcome.eliminated + outcome.exhausted, 1.0)
+
+        self.assertRaises(ValueError, lambda: TowerModel(2, ArrayR.from_list([1]), ArrayR(0)))
+
+    @number("5.18")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @advanced()
+    @timeout()
+    def test_matches_tower(self):
+        # Battles are deterministic, so the model should predict the tower's run with certainty.
+        for seed in range(5):
+            RandomGen.set_seed(seed)
+            bt = BattleTower(Battle(verbosity=0))
+            bt.set_my_team(MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM))
+            bt.generate_teams(8)
+            for i in range(len(bt.enemy_teams)):
+                # Single life enemies, so the tower can be cleared.
+                bt.enemy_teams[i].lives = 1
+            bt.set_enemy_teams(bt.enemy_teams)
+            bt.next_battle()
+
+            outcome = TowerModel.from_tower(bt, MatchupTable()).solve()
+            battles = 0
+            while bt.battles_remaining():
+                bt.next_battle()
+                battles += 1
+            self.assertAlmostEqual(outcome.expected_battles, battles)
+            if bt.my_team.lives <= 0:
+                self.assertAlmostEqual(outcome.eliminated, 1.0)
+            elif bt.enemies_alive == 0:
+                self.assertAlmostEqual(outcome.cleared, 1.0)
+            else:
+                self.assertAlmostEqual(outcome.exhausted, 1.0)
@@ -0,0 +1,49 @@
+import pickle
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from elements import EffectivenessCalculator
+from data_structures.typed_array import Float64Array, Int32Array, Int64Array
+
+class TestTypedArray(TestCase):
+
+    @number("7.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_interface(self):
+        ints = Int32Array(4)
+        self.assertListEqual(ints.to_list(), [0, 0, 0, 0])
+        ints[1:3] = [7, 8]
+        self.assertEqual(str(ints), "[0, 7, 8, 0]")
+        self.assertEqual(ints.index(8), 2)
+        self.assertRaises(ValueError, lambda: ints.index(9))
+        self.assertRaises(OverflowError, lambda: ints.__setitem__(0, 1 << 40))
+        with self.assertRaises(ValueError):
+            ints[0:2] = [1, 2, 3]
+
+        longs = Int64Array.from_list([1 << 40, -3])
+        longs.extend([5])
+        self.assertListEqual(list(longs), [1 << 40, -3, 5])
+        self.assertListEqual(longs[::2].to_list(), [1 << 40, 5])
+
+        floats = Float64Array.from_list([0.5, 2])
+        copy = floats.copy()
+        floats[0] = 1.5
+        self.assertListEqual(copy.to_list(), [0.5, 2.0])
+        self.assertListEqual(pickle.loads(pickle.dumps(floats)).to_list(), [1.5, 2.0])
+
+        # The values are contiguous and shared through the buffer protocol.
+        view = floats.as_memoryview()
+        self.assertEqual((view.format, view.itemsize, view.nbytes), ("d", 8, 16))
+        view[1] = 4.0
+        self.assertEqual(floats[1], 4.0)
+
+    @number("7.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_effectiveness_table(self):
+        matrix = EffectivenessCalculator.instance.matrix
+        self.assertIsInstance(matrix, Float64Array)
+        self.assertEqual(len(matrix), EffectivenessCalculator.instance.n_elements ** 2)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+from battle import Battle
+from ruleset import Ruleset
+from team import MonsterTeam
+
+from data_structures.referential_array import ArrayR
+from data_structures.stack_adt import ArrayStack
+
+
+def play_match(team1: MonsterTeam, team2: MonsterTeam, ruleset: Ruleset, verbosity: int = 0) -> Battle.Result:
+    """
+    Battle two teams and regenerate them afterwards, returning the result.
+    Module level so it can be sent to worker processes.
+    """
+    result = Battle(verbosity=verbosity, ruleset=ruleset).battle(team1, team2)
+    team1.regenerate_team()
+    team2.regenerate_team()
+    return result
+
+
+# Teams a worker process was started with, so that matches only need to carry indices.
+_worker_teams = None
+
+
+def _init_worker(teams: ArrayR[MonsterTeam], ruleset: Ruleset, verbosity: int) -> None:
+    global _worker_teams
+    _worker_teams = (teams, ruleset, verbosity)
+
+
+def _play_in_worker(team1: int, team2: int) -> Battle.Result:
+    teams, ruleset, verbosity = _worker_teams
+    return play_match(teams[team1], teams[team2], ruleset, verbosity)
+
+
+class Tournament:
+    """
+    Knockout tournament over a bracket in the format validated by tower.tournament_balanced.
+
+    The bracket is given in postfix: every token other than "+" is a team, and "+" is a match
+    between the winners of the two brackets before it. The i-th team token plays with teams[i].
+
+    Nodes 0..n_teams-1 are the teams and nodes n_teams.. are the matches, numbered in the order
+    of their "+" token. Matches are grouped into rounds by their depth in the bracket, and all
+    matches of a round are independent so they are played concurrently.
+
+    Usage:
+        tournament = Tournament(ArrayR.from_list(["A", "B", "+", "C", "D", "+", "+"]), teams)
+        champion = tournament.run()  # Index into teams
+    """
+
+    def __init__(self, tournament_array: ArrayR[str], teams: ArrayR[MonsterTeam], ruleset: Optional[Ruleset] = None, verbosity: int = 0) -> None:
+        """
+        Parse the bracket.
+        :raises ValueError: if the bracket is not a valid tournament, or the number of teams doesn't match it.
+        :complexity: O(n) where n is the number of tokens.
+        """
+        self.teams = teams
+        self.ruleset = ruleset or Ruleset.default()
+        self.verbosity = verbosity
+
+        n_teams = 0
+        for i in range(len(tournament_array)):
+            if tournament_array[i] != "+":
+                n_teams += 1
+        if n_teams != len(teams):
+            raise ValueError(f"The bracket has {n_teams} teams but {len(teams)} were given.")
+        self.n_teams = n_teams
+        self.n_matches = len(tournament_array) - n_teams
+
+        self.names: ArrayR[str] = ArrayR(n_teams)
+        self.left: ArrayR[int] = ArrayR(self.n_matches)
+        self.right: ArrayR[int] = ArrayR(self.n_matches)
+        self.depth: ArrayR[int] = ArrayR(self.n_matches)
+        self.rounds = 0
+
+        stack = ArrayStack(len(tournament_array))
+        team, match = 0, 0
+        for i in range(len(tournament_array)):
+            if tournament_array[i] != "+":
+                self.names[team] = tournament_array[i]
+                stack.push(team)
+                team += 1
+                continue
+            if len(stack) < 2:
+                raise ValueError(f"Match at token {i} doesn't have two brackets to join.")
+            self.right[match] = stack.pop()
+            self.left[match] = stack.pop()
+            self.depth[match] = 1 + max(self._node_depth(self.left[match]), self._node_depth(self.right[match]))
+            self.rounds = max(self.rounds, self.depth[match])
+            stack.push(n_teams + match)
+            match += 1
+        if len(stack) != 1:
+            raise ValueError("The bracket doesn't join into a single final.")
+        self.final = stack.pop()
+
+        # Matches grouped by round in one counting pass: round r is round_order[round_start[r]:round_start[r + 1]].
+        self.round_start: ArrayR[int] = ArrayR(self.rounds + 2)
+        for r in range(self.rounds + 2):
+            self.round_start[r] = 0
+        for match in range(self.n_matches):
+            self.round_start[self.depth[match] + 1] += 1
+        for r in range(1, self.rounds + 2):
+            self.round_start[r] += self.round_start[r - 1]
+        self.round_order: ArrayR[int] = ArrayR(self.n_matches)
+        free = self.round_start.copy()
+        for match in range(self.n_matches):
+            self.round_order[free[self.depth[match]]] = match
+            free[self.depth[match]] += 1
+
+        # Results of the last run, by match number.
+        self.results: ArrayR[Battle.Result] = ArrayR(self.n_matches)
+        self.winners: ArrayR[int] = ArrayR(self.n_matches)
+
+    def _node_depth(self, node: int) -> int:
+        return 0 if node < self.n_teams else self.depth[node - self.n_teams]
+
+    def _node_winner(self, node: int) -> int:
+        return node if node < self.n_teams else self.winners[node - self.n_teams]
+
+    def round_matches(self, round_number: int) -> ArrayR[int]:
+        """
+        Returns the matches played in the given round (1 being the first round), in bracket order.
+        :complexity: O(k) where k is the number of matches in the round.
+        """
+        if not 1 <= round_number <= self.rounds:
+            return ArrayR(0)
+        return self.round_order[self.round_start[round_number]:self.round_start[round_number + 1]]
+
+    def run(self, executor: Optional[Executor] = None, max_workers: Optional[int] = None) -> int:
+        """
+        Play the whole tournament and return the index of the champion in teams.
+
+        Every round is submitted to the executor at once, and the next round starts when it is done.
+        Defaults to a ProcessPoolExecutor, so matches are played on several cores. Each of its workers
+        receives the teams and ruleset once when it starts, and every match only sends it two team
+        indices. A given executor is sent the teams and ruleset with every match. Battles are pure
+        Python, so a ThreadPoolExecutor plays them one at a time, but keeps everything in one process.
+        The left bracket goes through on a draw.
+        Results are stored in self.results and self.winners, indexed by match number.
+        :complexity: O(rounds) waits on the executor, plus the cost of every battle.
+        """
+        if self.n_matches == 0:
+            return self.final
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.teams, self.ruleset, self.verbosity),
+            )
+        try:
+            for round_number in range(1, self.rounds + 1):
+                matches = self.round_matches(round_number)
+                futures = ArrayR(len(matches))
+                for i in range(len(matches)):
+                    match = matches[i]
+                    team1 = self._node_winner(self.left[match])
+                    team2 = self._node_winner(self.right[match])
+                    if own_executor:
+                        futures[i] = executor.submit(_play_in_worker, team1, team2)
+                    else:
+                        futures[i] = executor.submit(play_match, self.teams[team1], self.teams[team2], self.ruleset, self.verbosity)
+                for i in range(len(matches)):
+                    match = matches[i]
+                    result = futures[i].result()
+                    self.results[match] = result
+                    if result == Battle.Result.TEAM2:
+                        self.winners[match] = self._node_winner(self.right[match])
+                    else:
+                        self.winners[match] = self._node_winner(self.left[match])
+        finally:
+            if own_executor:
+                executor.shutdown()
+        return self._node_winner(self.final)
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import sys
+from typing import Iterable
 
 from random_gen import RandomGen
 from team import MonsterTeam
@@ -6,7 +8,172 @@ from battle import Battle
 
 from elements import Element
 
+from data_structures.btree_sorted_list import BTreeSortedList
+from data_structures.bset import BSet
 from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+from data_structures.stack_adt import ArrayStack
+
+class MetaHistory:
+    """
+    Index over the elements present in every battle played in a tower.
+
+    For every element, prefix[k * N_ELEMENTS + element.value - 1] holds the number of the
+    first k battles the element appeared in, so any window of battles can be queried in
+    O(#elements) no matter how long it is. Battles are numbered from 0.
+    """
+
+    N_ELEMENTS = len(Element)
+    MIN_CAPACITY = 1
+
+    def __init__(self, capacity: int = 1) -> None:
+        self.length = 0
+        self.masks: ArrayR[BSet] = ArrayR(max(self.MIN_CAPACITY, capacity))
+        self.prefix: ArrayR[int] = ArrayR((len(self.masks) + 1) * self.N_ELEMENTS)
+        for i in range(self.N_ELEMENTS):
+            self.prefix[i] = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _resize(self) -> None:
+        """ Double the number of battles that fit. """
+        new_masks = ArrayR(2 * len(self.masks))
+        new_prefix = ArrayR((len(new_masks) + 1) * self.N_ELEMENTS)
+        for i in range(self.length):
+            new_masks[i] = self.masks[i]
+        for i in range((self.length + 1) * self.N_ELEMENTS):
+            new_prefix[i] = self.prefix[i]
+        self.masks, self.prefix = new_masks, new_prefix
+
+    def append(self, elements: BSet) -> None:
+        """
+        Record the elements present in the next battle.
+        :complexity: O(#elements), amortised over resizes.
+        """
+        if self.length == len(self.masks):
+            self._resize()
+        self.masks[self.length] = elements
+        prev, cur = self.length * self.N_ELEMENTS, (self.length + 1) * self.N_ELEMENTS
+        for i in range(self.N_ELEMENTS):
+            self.prefix[cur + i] = self.prefix[prev + i] + (1 if (i + 1) in elements else 0)
+        self.length += 1
+
+    def _check_window(self, i: int, j: int) -> None:
+        if not 0 <= i <= j < self.length:
+            raise IndexError(f"No battles {i}..{j} in a history of {self.length} battles")
+
+    def count(self, element: Element, i: int, j: int) -> int:
+        """
+        Returns the number of battles i..j (inclusive) that element appeared in.
+        :complexity: O(1)
+        """
+        self._check_window(i, j)
+        offset = element.value - 1
+        return self.prefix[(j + 1) * self.N_ELEMENTS + offset] - self.prefix[i * self.N_ELEMENTS + offset]
+
+    def present(self, i: int, j: int) -> ArrayR[Element]:
+        """
+        Returns the elements that appeared in any of the battles i..j (inclusive), in Element order.
+        :complexity: O(#elements)
+        """
+        return self._window(i, j, True)
+
+    def absent(self, i: int, j: int) -> ArrayR[Element]:
+        """
+        Returns the elements that appeared in none of the battles i..j (inclusive), in Element order.
+        :complexity: O(#elements)
+        """
+        return self._window(i, j, False)
+
+    def _window(self, i: int, j: int, present: bool) -> ArrayR[Element]:
+        self._check_window(i, j)
+        return ArrayR.from_list([element for element in Element if (self.count(element, i, j) > 0) == present])
+
+    def last_appearance(self, element: Element, before: int|None = None) -> int|None:
+        """
+        Returns the last battle before `before` (defaults to all battles) that element appeared in,
+        or None if it hasn't appeared.
+        :complexity: O(log n) where n is the number of battles.
+        """
+        before = self.length if before is None else min(before, self.length)
+        offset = element.value - 1
+        target = self.prefix[before * self.N_ELEMENTS + offset]
+        if target == 0:
+            return None
+        # Smallest k with prefix count == target: battle k-1 is the last appearance.
+        low, high = 1, before
+        while low < high:
+            mid = (low + high) // 2
+            if self.prefix[mid * self.N_ELEMENTS + offset] < target:
+                low = mid + 1
+            else:
+                high = mid
+        return low - 1
+
+
+class EnemyStream:
+    """
+    Enemy teams of a tower that are generated only when the tower is about to need them.
+
+    Indexes like the ArrayR of enemy teams, but only holds the current team and the `lookahead`
+    teams after it, in a ring buffer. Teams are generated in index order, so as long as nothing
+    else draws from RandomGen in between, the teams are the same as with generate_teams.
+    `elements` indexes the element sets of the held teams the same way.
+    """
+
+    class Elements:
+        """ Read-only view of the element sets of the teams held by the stream. """
+
+        def __init__(self, stream: EnemyStream) -> None:
+            self.stream = stream
+
+        def __getitem__(self, index: int) -> BSet:
+            return self.stream.element_window[self.stream._slot(index)]
+
+    def __init__(self, tower: BattleTower, n: int|None, lookahead: int) -> None:
+        """
+        :n: Number of enemy teams, None for a tower without end.
+        :lookahead: How many teams after the current one should be generated already.
+        """
+        if lookahead < 0:
+            raise ValueError("lookahead should be at least 0.")
+        self.tower = tower
+        self.n = n
+        self.team_window: ArrayR[MonsterTeam] = ArrayR(lookahead + 1)
+        self.element_window: ArrayR[BSet] = ArrayR(lookahead + 1)
+        self.elements = EnemyStream.Elements(self)
+        self.start = 0
+        self.generated = 0
+        self.advance_to(0)
+
+    def __len__(self) -> int:
+        return self.n if self.n is not None else sys.maxsize
+
+    def _slot(self, index: int) -> int:
+        if not self.start <= index < self.generated:
+            raise IndexError(f"Enemy team {index} is not held by the stream")
+        return index % len(self.team_window)
+
+    def __getitem__(self, index: int) -> MonsterTeam:
+        return self.team_window[self._slot(index)]
+
+    def advance_to(self, index: int) -> None:
+        """
+        Drop the teams before index and generate up to `lookahead` teams after it.
+        :complexity: O(lookahead) teams generated at most.
+        """
+        self.start = index
+        end = index + len(self.team_window)
+        if self.n is not None:
+            end = min(end, self.n)
+        while self.generated < end:
+            team = self.tower.generate_team()
+            slot = self.generated % len(self.team_window)
+            self.team_window[slot] = team
+            self.element_window[slot] = self.tower.team_elements(team)
+            self.generated += 1
+
 
 class BattleTower:
 
@@ -18,22 +185,96 @@ class BattleTower:
         self.my_team = None
         self.enemy_teams = None
         self.current_enemy_index = 0
+        self.battles_played = 0
+        # Number of enemy teams with lives > 0, kept up to date by generate_teams and next_battle.
+        self.enemies_alive = 0
+        # Enemy teams ranked by (lives, position), built by the first sort_by_lives.
+        # ranking_items[i] is the ranking entry of enemy_teams[i], whose value is i.
+        self.ranking: BTreeSortedList[int] = None
+        self.ranking_items: ArrayR[ListItem] = None
+        # Elements present in each team, as sets of Element values.
+        self.my_elements: BSet = None
+        self.enemy_elements: ArrayR[BSet] = None
+        # Elements of every enemy team battled so far.
+        self.seen_elements = BSet()
+        # Elements present in each battle played, my team included. None for streamed towers.
+        self.history = MetaHistory()
+
+    @staticmethod
+    def team_elements(team: MonsterTeam) -> BSet:
+        """
+        Returns the set of Element values present in the team's lineup.
+        :complexity: O(len(team))
+        """
+        elements = BSet()
+        for monster in team.original:
+            elements.add(Element.from_string(monster.get_element()).value)
+        return elements
 
     def set_my_team(self, team: MonsterTeam) -> None:
         # Generate the team lives here too.
         self.my_team = team
         self.my_team.lives = RandomGen.randint(self.MIN_LIVES, self.MAX_LIVES)
+        self.my_elements = self.team_elements(team)
+
+    def generate_team(self) -> MonsterTeam:
+        """ Generate a single random enemy team along with its lives. """
+        enemy = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
+        enemy.lives = RandomGen.randint(self.MIN_LIVES, self.MAX_LIVES)
+        return enemy
 
     def generate_teams(self, n: int) -> None:
-        self.enemy_teams = ArrayR(n)
+        teams = ArrayR(n)
         
         for i in range(n):
-            enemy = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.RANDOM)
-            enemy.lives = RandomGen.randint(self.MIN_LIVES, self.MAX_LIVES)
-            self.enemy_teams[i] = enemy
+            teams[i] = self.generate_team()
+
+        self.set_enemy_teams(teams)
+
+    def stream_teams(self, n: int|None = None, lookahead: int = 1) -> None:
+        """
+        Like generate_teams, but each enemy team is only generated once it is within `lookahead`
+        teams of the current one, and dropped once it has been battled.
+        With n None the tower never runs out of teams. Memory stays O(lookahead) either way,
+        so the battle history is not recorded and sort_by_lives is not available.
+        :complexity: O(lookahead) teams generated now, then one per battle.
+        """
+        self.current_enemy_index = 0
+        self.battles_played = 0
+        self.seen_elements = BSet()
+        self.history = None
+        self.ranking = None
+        self.ranking_items = None
+        # Every team not generated yet will have at least MIN_LIVES.
+        self.enemies_alive = n if n is not None else sys.maxsize
+        self.enemy_teams = EnemyStream(self, n, lookahead)
+        self.enemy_elements = self.enemy_teams.elements
+
+    def set_enemy_teams(self, teams: ArrayR[MonsterTeam]) -> None:
+        """
+        Use the given teams, with their lives already set, as the enemies of this tower.
+        :complexity: O(n) where n is the total size of the teams.
+        """
+        self.enemy_teams = teams
+        self.current_enemy_index = 0
+        self.battles_played = 0
+        self.enemy_elements = ArrayR(len(teams))
+        self.seen_elements = BSet()
+        self.history = MetaHistory(len(teams))
+        self.enemies_alive = 0
+        self.ranking = None
+        self.ranking_items = None
+        for i in range(len(teams)):
+            self.enemy_elements[i] = self.team_elements(teams[i])
+            if teams[i].lives > 0:
+                self.enemies_alive += 1
 
     def battles_remaining(self) -> bool:
-        return (self.my_team.lives > 0 and any(enemy.lives > 0 for enemy in self.enemy_teams)) and len(self.enemy_teams) > self.current_enemy_index
+        """
+        Whether my team and at least one enemy team have lives left, and there is an enemy left to battle.
+        :complexity: O(1), using the enemies_alive counter.
+        """
+        return self.my_team.lives > 0 and self.enemies_alive > 0 and len(self.enemy_teams) > self.current_enemy_index
 
     def next_battle(self) -> tuple[Battle.Result, MonsterTeam, MonsterTeam, int, int]:
         if not self.battles_remaining():
@@ -44,8 +285,13 @@ class BattleTower:
         
         battle_result = self.battle.battle(team1=team1, team2=team2)
         
+        self.seen_elements |= self.enemy_elements[self.current_enemy_index]
+        if self.history is not None:
+            self.history.append(self.my_elements | self.enemy_elements[self.current_enemy_index])
         self.current_enemy_index += 1
+        self.battles_played += 1
         
+        enemy_was_alive = team2.lives > 0
         if battle_result == Battle.Result.TEAM1:
             team2.lives -= 1
         elif battle_result == Battle.Result.TEAM2:
@@ -53,43 +299,119 @@ class BattleTower:
         elif battle_result == Battle.Result.DRAW:
             team1.lives -= 1
             team2.lives -= 1
+        if enemy_was_alive and team2.lives <= 0:
+            self.enemies_alive -= 1
+        if self.ranking is not None:
+            self.update_ranking(self.current_enemy_index - 1)
             
         team1.regenerate_team()
         team2.regenerate_team()
+        if isinstance(self.enemy_teams, EnemyStream):
+            self.enemy_teams.advance_to(self.current_enemy_index)
         
         return battle_result, team1, team2, team1.lives, team2.lives
         
 
     def out_of_meta(self) -> ArrayR[Element]:
-        if not self.battles_remaining() or self.current_enemy_index == 0:
+        """
+        Returns the elements of the enemy teams battled so far that are in neither the
+        upcoming enemy team nor my team, in Element order.
+        :complexity: O(#elements), using the element sets kept for every team.
+        """
+        if not self.battles_remaining() or self.battles_played == 0:
             return ArrayR.from_list([])
-        
-        previous_team = self.enemy_teams[self.current_enemy_index - 1].group
-        upcoming_team = self.enemy_teams[self.current_enemy_index].group
-        
-        previous_team_elements = [Element.from_string(i.get_element()) for i in previous_team]
-        upcoming_team_elements = [Element.from_string(i.get_element()) for i in upcoming_team]
-        player_team_elements = [Element.from_string(i.get_element()) for i in self.my_team.group]
-        
-        for i in upcoming_team_elements:
-            if i not in player_team_elements:
-                player_team_elements.append(i)
-        
-        metas = []
-        
-        for i in previous_team_elements:
-            if i not in player_team_elements:
-                metas.append(i)
-                
-        return ArrayR.from_list(metas)
-
-    def sort_by_lives(self):
-        # 1054 ONLY
-        raise NotImplementedError
-
-def tournament_balanced(tournament_array: ArrayR[str]):
-    # 1054 ONLY
-    raise NotImplementedError
+
+        upcoming_elements = self.enemy_elements[self.current_enemy_index]
+        metas = self.seen_elements.difference(upcoming_elements | self.my_elements)
+
+        # Element values follow Element order, and BSet iterates them in increasing order.
+        return ArrayR.from_list([Element(value) for value in metas])
+
+    def sort_by_lives(self) -> None:
+        """
+        Stably reorders the enemy teams by increasing lives, and starts the next battle from the first of them.
+
+        The first call ranks the teams in a sorted list. next_battle then keeps that ranking up to date
+        (see update_ranking), so later calls only have to copy the order back into enemy_teams.
+        :complexity: O(n log n) for the first call, O(n) afterwards, where n is the number of enemy teams.
+        :raises ValueError: if the enemy teams are streamed.
+        """
+        if isinstance(self.enemy_teams, EnemyStream):
+            raise ValueError("Streamed enemy teams cannot be sorted.")
+        n = len(self.enemy_teams)
+        if self.ranking is None:
+            self.build_ranking()
+
+        teams, elements = ArrayR(n), ArrayR(n)
+        for i, item in enumerate(list(self.ranking)):
+            teams[i] = self.enemy_teams[item.value]
+            elements[i] = self.enemy_elements[item.value]
+            item.value, item.key = i, (teams[i].lives, i)
+            self.ranking_items[i] = item
+        # Positions are increasing along the ranking, so the renumbered items are already in order.
+        self.ranking.clear()
+        self.ranking.add_many(self.ranking_items)
+        self.enemy_teams, self.enemy_elements = teams, elements
+        self.current_enemy_index = 0
+
+    def build_ranking(self) -> None:
+        """
+        Ranks the enemy teams by (lives, position) in a sorted list, without reordering them.
+        :complexity: O(n log n) where n is the number of enemy teams.
+        """
+        n = len(self.enemy_teams)
+        items = ArrayR(n)
+        for i in range(n):
+            items[i] = ListItem(i, (self.enemy_teams[i].lives, i))
+        self.ranking_items = ArrayR(n)
+        for i in range(n):
+            self.ranking_items[i] = items[i]
+        self.ranking = BTreeSortedList()
+        self.ranking.add_many(items)
+
+    def update_ranking(self, index: int) -> None:
+        """
+        Moves enemy_teams[index] to its place in the ranking after its lives changed.
+        Called by next_battle for the team just battled once sort_by_lives has been used.
+        :complexity: O(log n) to find both positions, and to move the item in the sorted list.
+        """
+        item = self.ranking_items[index]
+        self.ranking.delete_at_index(self.ranking.index(item))
+        item.key = (self.enemy_teams[index].lives, index)
+        self.ranking.add(item)
+
+TOURNAMENT_MAX_DEPTH = 64
+
+def tournament_balanced(tournament_array: ArrayR[str] | Iterable[str]) -> bool:
+    """
+    Whether the tournament, given in postfix with "+" joining the two brackets before it,
+    is valid and every "+" joins two brackets with the same number of teams.
+
+    Tokens are read once, in order, so any iterable (such as a generator) can be given.
+    The stack holds the team counts of the brackets still waiting to be joined. In a balanced
+    tournament these strictly decrease from the bottom, except for the top two which may be equal
+    right before a "+". Anything else can never be balanced and is rejected straight away, so the
+    stack never holds more than TOURNAMENT_MAX_DEPTH + 1 brackets.
+    :complexity: O(n) time and O(depth) memory, where n is the number of tokens.
+    """
+    stack = ArrayStack(TOURNAMENT_MAX_DEPTH + 1)
+    top_pair_equal = False
+    for token in tournament_array:
+        if token == "+":
+            if len(stack) < 2 or not top_pair_equal:
+                return False
+            size = stack.pop() + stack.pop()
+            top_pair_equal = False
+        else:
+            size = 1
+        if not stack.is_empty():
+            if stack.peek() < size or (stack.peek() == size and top_pair_equal):
+                return False
+            top_pair_equal = stack.peek() == size
+        if stack.is_full():
+            return False
+        stack.push(size)
+    return len(stack) == 1
 
 if __name__ == "__main__":
     from helpers import Faeboa
@@ -0,0 +1,182 @@
+"""
+Exact outcome model of a BattleTower run.
+
+Instead of simulating a tower many times, each battle is summarised by the probabilities of
+my team winning, drawing or losing against that enemy team, and the run is solved as an
+absorbing Markov chain over the bookkeeping done by BattleTower.next_battle.
+"""
+from __future__ import annotations
+from typing import NamedTuple, Optional
+
+from battle import Battle
+from ruleset import Ruleset
+from team import MonsterTeam
+from tournament import play_match
+
+from data_structures.referential_array import ArrayR
+
+
+class Matchup(NamedTuple):
+    """ Probabilities of my team winning, drawing and losing a battle against one enemy team. """
+    win: float
+    draw: float
+    loss: float
+
+
+class TowerOutcome(NamedTuple):
+    """
+    How a tower run ends, as probabilities adding up to 1, and the expected number of battles.
+    cleared: every enemy team ran out of lives while my team had lives left.
+    eliminated: my team ran out of lives.
+    exhausted: every enemy team was battled, with lives left on both sides.
+    """
+    cleared: float
+    eliminated: float
+    exhausted: float
+    expected_battles: float
+
+
+class MatchupTable:
+    """
+    Matchup probabilities between pairs of teams, estimated once per pair of lineups and cached.
+
+    Battles are deterministic for a given pair of lineups, so a single sample is exact; more
+    samples only help when battles involve chance.
+    """
+
+    def __init__(self, ruleset: Optional[Ruleset] = None, samples: int = 1) -> None:
+        if samples <= 0:
+            raise ValueError("samples should be positive.")
+        self.ruleset = ruleset or Ruleset.default()
+        self.samples = samples
+        self.table: dict[tuple, Matchup] = {}
+
+    @staticmethod
+    def lineup(team: MonsterTeam) -> tuple:
+        """ Everything about a team that affects how its battles go. """
+        return (team.team_mode, team.sort_key, tuple((type(monster), monster.get_level()) for monster in team.original))
+
+    def get(self, team1: MonsterTeam, team2: MonsterTeam) -> Matchup:
+        """
+        Returns the matchup of team1 against team2, battling them if this pair of lineups is new.
+        :complexity: O(1) for a known pair, otherwise `samples` battles.
+        """
+        key = (self.lineup(team1), self.lineup(team2))
+        if key not in self.table:
+            counts = {result: 0 for result in Battle.Result}
+            for _ in range(self.samples):
+                counts[play_match(team1, team2, self.ruleset)] += 1
+            self.table[key] = Matchup(
+                counts[Battle.Result.TEAM1] / self.samples,
+                counts[Battle.Result.DRAW] / self.samples,
+                counts[Battle.Result.TEAM2] / self.samples,
+            )
+        return self.table[key]
+
+    def __setitem__(self, key: tuple[MonsterTeam, MonsterTeam], matchup: Matchup) -> None:
+        """ Set the matchup of a pair of teams directly, e.g. from a previous estimate. """
+        team1, team2 = key
+        self.table[(self.lineup(team1), self.lineup(team2))] = matchup
+
+
+class TowerModel:
+    """
+    Absorbing Markov chain of a tower run.
+
+    Enemy teams are battled in order, once each, so the enemy index only ever increases and
+    the chain is solved exactly by pushing the probability of every state forward one battle
+    at a time. Besides the enemy index and my lives, a state only needs to know whether every
+    enemy battled so far is out of lives: enemies not battled yet keep their lives, so the
+    number of enemies alive can only reach 0 when the last enemy with lives is battled.
+
+    Usage:
+        model = TowerModel.from_tower(tower, MatchupTable())
+        outcome = model.solve()
+    """
+
+    def __init__(self, my_lives: int, enemy_lives: ArrayR[int], matchups: ArrayR[Matchup], enemies_alive: int = 0) -> None:
+        """
+        :my_lives: Lives of my team at the start.
+        :enemy_lives: Lives of each enemy team still to be battled, in order.
+        :matchups: Matchup against each of those enemy teams.
+        :enemies_alive: Number of enemy teams already battled that still have lives.
+        :raises ValueError: if enemy_lives and matchups don't have the same length.
+        """
+        if len(enemy_lives) != len(matchups):
+            raise ValueError(f"Expected a matchup for each of the {len(enemy_lives)} enemy teams, got {len(matchups)}.")
+        self.my_lives = my_lives
+        self.enemy_lives = enemy_lives
+        self.matchups = matchups
+        self.enemies_alive = enemies_alive
+
+    @classmethod
+    def from_tower(cls, tower, table: MatchupTable) -> TowerModel:
+        """
+        Model the rest of the tower's run, from its current state.
+        :complexity: O(n) matchup lookups where n is the number of enemy teams.
+        """
+        start = tower.current_enemy_index
+        n = len(tower.enemy_teams) - start
+        enemy_lives, matchups = ArrayR(n), ArrayR(n)
+        for i in range(n):
+            enemy = tower.enemy_teams[start + i]
+            enemy_lives[i] = enemy.lives
+            matchups[i] = table.get(tower.my_team, enemy)
+        enemies_alive = 0
+        for i in range(start):
+            if tower.enemy_teams[i].lives > 0:
+                enemies_alive += 1
+        return cls(tower.my_team.lives, enemy_lives, matchups, enemies_alive)
+
+    def solve(self) -> TowerOutcome:
+        """
+        Returns the exact probabilities of each outcome, and the expected number of battles.
+        :complexity: O(n * L) where n is the number of enemy teams and L my team's lives.
+        """
+        n = len(self.enemy_lives)
+        last_alive = -1
+        for i in range(n):
+            if self.enemy_lives[i] > 0:
+                last_alive = i
+        if self.my_lives <= 0:
+            return TowerOutcome(0.0, 1.0, 0.0, 0.0)
+        if last_alive == -1 and self.enemies_alive == 0:
+            return TowerOutcome(1.0, 0.0, 0.0, 0.0)
+
+        # prob[lives][clear] is the probability of reaching the next battle with those lives,
+        # clear telling whether every enemy battled so far is out of lives.
+        prob = ArrayR(self.my_lives + 1)
+        for lives in range(self.my_lives + 1):
+            prob[lives] = [0.0, 0.0]
+        prob[self.my_lives][self.enemies_alive == 0] = 1.0
+        cleared = eliminated = expected_battles = 0.0
+
+        for i in range(n):
+            win, draw, loss = self.matchups[i]
+            enemy_lives = self.enemy_lives[i]
+            nxt = ArrayR(self.my_lives + 1)
+            for lives in range(self.my_lives + 1):
+                nxt[lives] = [0.0, 0.0]
+            for lives in range(1, self.my_lives + 1):
+                for clear in (0, 1):
+                    p = prob[lives][clear]
+                    if p == 0.0:
+                        continue
+                    expected_battles += p
+                    # (probability, lives lost by me, lives lost by the enemy)
+                    for q, my_loss, enemy_loss in ((win, 0, 1), (draw, 1, 1), (loss, 1, 0)):
+                        if q == 0.0:
+                            continue
+                        still_clear = clear and enemy_lives - enemy_loss <= 0
+                        if lives - my_loss == 0:
+                            eliminated += p * q
+                        elif i == last_alive and still_clear:
+                            cleared += p * q
+                        else:
+                            nxt[lives - my_loss][still_clear] += p * q
+            prob = nxt
+
+        exhausted = 0.0
+        for lives in range(1, self.my_lives + 1):
+            exhausted += prob[lives][0] + prob[lives][1]
+        return TowerOutcome(cleared, eliminated, exhausted, expected_battles)